@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Offline analytics over Dino Runner telemetry logs (see `Telemetry` in
+tk_snake_game.py)
+
+Each log is streamed CHUNK_RECORDS records at a time into one reused
+NumPy structured array, and every chunk is folded into fixed-size count
+arrays (a `Tally`), so memory stays the same however large the logs are.
+Files are spread over a process pool, one task per file, and the
+per-file tallies are summed.
+
+Per difficulty it counts:
+- deaths per obstacle variant (cactus width x height, bird height) and
+  speed band at the time of death, giving each variant's share of the
+  deaths at each speed; and spawns per variant and speed band at spawn,
+  giving each variant's kill rate (deaths per obstacle spawned)
+- coins spawned and collected per speed band and per time-into-run bin
+  at the coin's spawn, giving the pickup rate
+- run length and final score histograms
+
+Speed is the scroll speed in px/tick (slow motion included), in bands
+SPEED_BAND wide. Records before a file's first run or difficulty record
+(the head of a rotated file) have no known difficulty and are skipped.
+
+Run
+===
+python tk_snake_game.py --headless 1000000 --telemetry runs.bin   # make a log
+python dino_analytics.py runs.bin*                                 # it and its rotations
+python dino_analytics.py logs/ -d 3 --out analytics.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from tk_snake_game import (FPS, MIN_SPEED, MAX_SPEED, OBSTACLE_VARIANTS, TM_RECORD, TM_FIELDS, TM_MAGIC,
+                           TM_KINDS, TM_RUN, TM_SPAWN, TM_COIN, TM_DEATH, TM_DIFFICULTY, TM_COIN_SPAWN)
+
+CHUNK_RECORDS = 1 << 18  # 4 MiB of binary records per read
+RECORD = np.dtype([('tick', '<u4'), ('kind', 'u1'), ('arg', 'u1'), ('run', '<u2'), ('a', '<f4'), ('b', '<f4')])
+assert RECORD.itemsize == TM_RECORD.size and RECORD.names == TM_FIELDS
+
+DIFFICULTIES = 3
+VARIANTS = len(OBSTACLE_VARIANTS)
+SPEED_BAND = 1.0
+SPEED_BANDS = int((MAX_SPEED - MIN_SPEED) / SPEED_BAND)  # slower (slow motion) counts in the first
+RUN_BIN_S = 10     # time-into-run bins, seconds
+RUN_BINS = 30      # the last one is open-ended
+SCORE_BIN = 500
+SCORE_BINS = 80
+
+
+# ------------------------------ Tally --------------------------------------- #
+
+class Tally:
+    """Fixed-size counts over any number of records; tallies add up."""
+
+    SHAPES = {
+        'spawns': (DIFFICULTIES, VARIANTS, SPEED_BANDS),
+        'deaths': (DIFFICULTIES, VARIANTS, SPEED_BANDS),
+        'coin_spawns': (DIFFICULTIES, SPEED_BANDS),
+        'coins': (DIFFICULTIES, SPEED_BANDS),
+        'coin_spawns_t': (DIFFICULTIES, RUN_BINS),
+        'coins_t': (DIFFICULTIES, RUN_BINS),
+        'run_length': (DIFFICULTIES, RUN_BINS),
+        'score': (DIFFICULTIES, SCORE_BINS),
+    }
+
+    def __init__(self):
+        self.counts = {k: np.zeros(shape, dtype=np.int64) for k, shape in self.SHAPES.items()}
+        self.records = 0
+        self.skipped = 0
+        self.files = 0
+
+    def __iadd__(self, other: 'Tally') -> 'Tally':
+        for k, arr in self.counts.items():
+            arr += other.counts[k]
+        self.records += other.records
+        self.skipped += other.skipped
+        self.files += other.files
+        return self
+
+    def count(self, name: str, *idx: np.ndarray):
+        arr = self.counts[name]
+        flat = np.ravel_multi_index(idx, arr.shape)
+        arr += np.bincount(flat, minlength=arr.size).reshape(arr.shape)
+
+    def to_json(self) -> Dict:
+        return {
+            'records': self.records,
+            'skipped': self.skipped,
+            'files': self.files,
+            'variants': list(OBSTACLE_VARIANTS),
+            'speed_bands': [MIN_SPEED + i * SPEED_BAND for i in range(SPEED_BANDS)],
+            'run_bin_s': RUN_BIN_S,
+            'score_bin': SCORE_BIN,
+            'counts': {k: v.tolist() for k, v in self.counts.items()},
+        }
+
+
+class FileState:
+    """What a chunk needs from the chunks before it in the same file."""
+    __slots__ = ('diff', 'run_start')
+
+    def __init__(self):
+        self.diff = 0       # 0 until a run or difficulty record is seen
+        self.run_start = 0  # tick of the latest run record
+
+
+def fold(tally: Tally, c: np.ndarray, state: FileState):
+    """Add one chunk of records (in log order) to `tally`."""
+    n = len(c)
+    kind, arg = c['kind'], c['arg'].astype(np.int64)
+    tick = c['tick'].astype(np.int64)
+    idx = np.arange(n)
+
+    # difficulty and run start in force at each record: forward-fill from the
+    # records that set them, starting from where the previous chunk ended
+    last = np.maximum.accumulate(np.where((kind == TM_RUN) | (kind == TM_DIFFICULTY), idx, -1))
+    diff = np.where(last >= 0, arg[np.maximum(last, 0)], state.diff)
+    last = np.maximum.accumulate(np.where(kind == TM_RUN, idx, -1))
+    start = np.where(last >= 0, tick[np.maximum(last, 0)], state.run_start)
+    state.diff, state.run_start = int(diff[-1]), int(start[-1])
+
+    known = (diff >= 1) & (diff <= DIFFICULTIES)
+    tally.records += n
+    tally.skipped += n - int(known.sum())
+    d = diff - 1
+    band = np.clip(((c['a'] - MIN_SPEED) / SPEED_BAND).astype(np.int64), 0, SPEED_BANDS - 1)
+    tbin = np.clip((tick - start) // (RUN_BIN_S * FPS), 0, RUN_BINS - 1)
+
+    m = known & (kind == TM_SPAWN) & (arg < VARIANTS)
+    tally.count('spawns', d[m], arg[m], band[m])
+    m = known & (kind == TM_DEATH) & (arg < VARIANTS)
+    tally.count('deaths', d[m], arg[m], band[m])
+    tally.count('run_length', d[m], tbin[m])
+    tally.count('score', d[m], np.clip(c['b'][m].astype(np.int64) // SCORE_BIN, 0, SCORE_BINS - 1))
+    m = known & (kind == TM_COIN_SPAWN)
+    tally.count('coin_spawns', d[m], band[m])
+    tally.count('coin_spawns_t', d[m], tbin[m])
+    # a pickup carries its coin's spawn speed and age, so it lands in the
+    # same bins as the spawn it is counted against
+    m = known & (kind == TM_COIN)
+    born = tick[m] - c['b'][m].astype(np.int64)
+    tally.count('coins', d[m], band[m])
+    tally.count('coins_t', d[m], np.clip((born - start[m]) // (RUN_BIN_S * FPS), 0, RUN_BINS - 1))
+
+
+# ------------------------------ Reading ------------------------------------- #
+
+def binary_chunks(path: str, buf: np.ndarray) -> Iterator[np.ndarray]:
+    """Views into `buf`, refilled from the file for each chunk."""
+    raw = buf.view(np.uint8)
+    with open(path, 'rb') as f:
+        head = f.read(len(TM_MAGIC) + 1)
+        if head[:len(TM_MAGIC)] != TM_MAGIC or head[-1] != RECORD.itemsize:
+            raise ValueError(f'{path}: not a telemetry file')
+        while True:
+            n = f.readinto(raw) // RECORD.itemsize  # a torn last record is ignored
+            if n == 0:
+                return
+            yield buf[:n]
+
+
+def jsonl_chunks(path: str, buf: np.ndarray) -> Iterator[np.ndarray]:
+    kinds = {name: i for i, name in enumerate(TM_KINDS)}
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            n = 0
+            for line in itertools.islice(f, len(buf)):
+                try:
+                    ev = json.loads(line)
+                    buf[n] = (ev['tick'], kinds.get(ev['kind'], 0), ev['arg'], ev['run'], ev['a'], ev['b'])
+                except (ValueError, KeyError, TypeError):
+                    continue  # a torn last line
+                n += 1
+            if n == 0:
+                return
+            yield buf[:n]
+
+
+def is_jsonl(path: str) -> bool:
+    # rotated files keep the name and gain a number: runs.jsonl.3
+    return '.jsonl' in os.path.basename(path)
+
+
+def analyse_file(args: Tuple[str, int]) -> Tally:
+    path, chunk = args
+    tally = Tally()
+    tally.files = 1
+    buf = np.empty(chunk, dtype=RECORD)
+    state = FileState()
+    reader = jsonl_chunks if is_jsonl(path) else binary_chunks
+    for c in reader(path, buf):
+        fold(tally, c, state)
+    return tally
+
+
+def expand(paths: List[str]) -> List[str]:
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(sorted(os.path.join(p, f) for f in os.listdir(p)
+                                if os.path.isfile(os.path.join(p, f))))
+        else:
+            files.append(p)
+    return files
+
+
+def analyse(paths: List[str], workers: Optional[int] = None, chunk: int = CHUNK_RECORDS) -> Tally:
+    files = expand(paths)
+    total = Tally()
+    if len(files) == 1 or workers == 1:
+        for f in files:
+            total += analyse_file((f, chunk))
+        return total
+    with ProcessPoolExecutor(workers) as pool:
+        for part in pool.map(analyse_file, [(f, chunk) for f in files]):
+            total += part
+    return total
+
+
+# ------------------------------ Report -------------------------------------- #
+
+def rate(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    return np.divide(num, den, out=np.full(num.shape, np.nan), where=den > 0)
+
+
+def report(t: Tally, difficulties: List[int], top: int = 3) -> List[str]:
+    c = t.counts
+    lines = [f"{t.records:,} records in {t.files} file(s), {t.skipped:,} without a known difficulty"]
+    for d in difficulties:
+        i = d - 1
+        deaths, spawns = c['deaths'][i], c['spawns'][i]
+        lines.append('')
+        lines.append(f"difficulty {d}: {int(deaths.sum()):,} deaths, {int(spawns.sum()):,} obstacles, "
+                     f"{int(c['coins'][i].sum()):,}/{int(c['coin_spawns'][i].sum()):,} coins collected")
+        lines.append('  deadliest obstacles by speed at death (share of the deaths)')
+        for b in range(SPEED_BANDS):
+            col = deaths[:, b]
+            if not col.any():
+                continue
+            lo = MIN_SPEED + b * SPEED_BAND
+            worst = np.argsort(-col, kind='stable')[:top]
+            cells = [f"{OBSTACLE_VARIANTS[v]} {col[v] / col.sum():.0%}" for v in worst if col[v]]
+            lines.append(f"  {lo:4.0f}-{lo + SPEED_BAND:<4.0f} {int(col.sum()):6,}  " + ', '.join(cells))
+        # the speed changes between spawn and death, so rates are per variant only
+        kill = rate(deaths.sum(axis=1), spawns.sum(axis=1))
+        lines.append('  kill rate per obstacle spawned')
+        lines.append('    ' + '  '.join(f"{OBSTACLE_VARIANTS[v]}:{kill[v]:.1%}"
+                                         for v in range(VARIANTS) if spawns[v].any()))
+        lines.append('  coin pickup rate by speed')
+        pick = rate(c['coins'][i], c['coin_spawns'][i])
+        lines.append('    ' + '  '.join(f"{MIN_SPEED + b * SPEED_BAND:.0f}:{pick[b]:.0%}"
+                                         for b in range(SPEED_BANDS) if c['coin_spawns'][i][b]))
+        lines.append(f'  coin pickup rate by time into run ({RUN_BIN_S}s bins)')
+        pick = rate(c['coins_t'][i], c['coin_spawns_t'][i])
+        lines.append('    ' + '  '.join(f"{b * RUN_BIN_S}s:{pick[b]:.0%}"
+                                         for b in range(RUN_BINS) if c['coin_spawns_t'][i][b]))
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description='Analytics over Dino Runner telemetry logs')
+    ap.add_argument('paths', nargs='+', help='telemetry files (binary or .jsonl) or directories of them')
+    ap.add_argument('-d', '--difficulty', type=int, action='append', choices=(1, 2, 3))
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--chunk', type=int, default=CHUNK_RECORDS, help='records per read')
+    ap.add_argument('--top', type=int, default=3, help='variants listed per speed band')
+    ap.add_argument('--out', help='also write the raw counts as JSON')
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    tally = analyse(args.paths, args.workers, args.chunk)
+    secs = time.perf_counter() - t0
+    diffs = args.difficulty or [d for d in range(1, DIFFICULTIES + 1) if tally.counts['spawns'][d - 1].any()]
+    print('\n'.join(report(tally, diffs, args.top)))
+    print(f"\n{tally.records / max(secs, 1e-9):,.0f} records/s over {secs:.2f}s")
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(tally.to_json(), f)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
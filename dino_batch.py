@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batched Dino Runner simulator: thousands of runs in lockstep with NumPy
+
+`BatchSim` keeps one row per run (player y/vy/on_ground/ducking, speed,
+distance, score, spawn timer) and a small ring buffer of obstacle slots per
+run, and advances every row with a handful of vectorised operations per
+tick. The physics is a transcription of `Player.update`/`jump`/`set_duck`,
+`Game.update_speed`, `Game.maybe_spawn` (obstacles only) and the
+`Cactus`/`Bird` hitboxes, in the same operation order, so the float
+results are bit-for-bit those of the real game; `verify()` checks that
+tick by tick against a `Game`.
+
+Not simulated: coins and power-ups (so no shield, no slowmo and no coin
+bonus), clouds, particles and sound. Scores are distance score only.
+
+Policies map a (rows, OBS_SIZE) observation array, in the `dino_env`
+layout, to an action per row (NOOP/JUMP/DUCK).
+
+Run
+===
+python dino_batch.py --episodes 10000 --policy jumper
+python dino_batch.py --verify 20000
+"""
+
+import sys
+import time
+import argparse
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from tk_snake_game import (Game, Bird, W, GROUND_Y, GRAVITY, JUMP_VELOCITY, DUCK_HEIGHT, RUN_HEIGHT,
+                           PLAYER_X, STEP_MS, DIFF_PRESETS, SPEED_RAMP_DIST, SPEED_RAMP_CAP,
+                           MIN_SPEED, MAX_SPEED, CACTUS_WIDTHS, CACTUS_HEIGHTS, BIRD_LIFTS)
+from dino_env import DinoEnv, NOOP, JUMP, DUCK, N_OBSTACLES, OBS_PLAYER, OBS_OBSTACLE, obs_size
+
+OBSTACLE_SLOTS = 8  # live obstacles per run; spawns are >= 36 ticks apart and cross in <= 240
+CACTUS, BIRD = 0, 1
+EMPTY = -1
+
+# obstacle shapes, the game's own (see Cactus/Bird.__init__)
+CACTUS_W = np.array(CACTUS_WIDTHS)
+CACTUS_H = np.array(CACTUS_HEIGHTS)
+BIRD_ALT = GROUND_Y - np.array(BIRD_LIFTS)
+BIRD_W, BIRD_H = 38, 24
+
+Policy = Callable[[np.ndarray], np.ndarray]
+
+
+RAMP_DEFAULTS = {'ramp_dist': SPEED_RAMP_DIST, 'ramp_cap': SPEED_RAMP_CAP,
+                 'min_speed': MIN_SPEED, 'max_speed': MAX_SPEED}
+
+
+class BatchSim:
+    """`n` independent runs of one difficulty preset, stepped together.
+
+    `preset` defaults to DIFF_PRESETS[difficulty]; it may also override the
+    speed ramp (the RAMP_DEFAULTS keys), which is how dino_tune sweeps it.
+    Rows are runs still in play; when runs end their results are recorded
+    and their rows dropped, so the arrays only ever hold live runs.
+    `ids` maps rows back to run numbers.
+    """
+
+    def __init__(self, n: int, difficulty: int = 2, seed: int = 0, preset: Optional[Dict] = None,
+                 slots: int = OBSTACLE_SLOTS):
+        self.preset = dict(RAMP_DEFAULTS, **(preset or DIFF_PRESETS[difficulty]))
+        self.rng = np.random.default_rng(seed)
+        self.n = n
+        self.tick = 0
+        self.ids = np.arange(n)
+        base = float(self.preset['base_speed'])
+        # player
+        self.y = np.full(n, float(GROUND_Y - RUN_HEIGHT))
+        self.vy = np.zeros(n)
+        self.on_ground = np.ones(n, dtype=bool)
+        self.ducking = np.zeros(n, dtype=bool)
+        # world
+        self.speed = np.full(n, base)
+        self.tick_speed = self.speed.copy()
+        self.distance = np.zeros(n)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.spawn_start = np.zeros(n)
+        self.spawn_dur = self.draw_interval(n)
+        # obstacle ring buffers: entity x, kind, entity width, box offset/size
+        self.ox = np.zeros((n, slots))
+        self.kind = np.full((n, slots), EMPTY, dtype=np.int8)
+        self.ow = np.zeros((n, slots))
+        self.bdx = np.zeros((n, slots))
+        self.by = np.zeros((n, slots))
+        self.bw = np.zeros((n, slots))
+        self.bh = np.zeros((n, slots))
+        self.omul = np.ones((n, slots))
+        self.tail = np.zeros(n, dtype=np.int64)
+        # results, by run number
+        self.survived = np.zeros(n, dtype=np.int64)
+        self.final_score = np.zeros(n, dtype=np.int64)
+        self.truncated = np.zeros(n, dtype=bool)
+
+    # ------------------------- Random draws --------------------------------- #
+    def draw_interval(self, k: int) -> np.ndarray:
+        p = self.preset
+        return self.rng.integers(p['obs_min'], p['obs_max'], size=k, endpoint=True).astype(np.float64)
+
+    def draw_obstacles(self, k: int):
+        """Kind, cactus width/height and bird altitude for `k` spawns."""
+        rng = self.rng
+        kind = np.where(rng.integers(0, 4, size=k) == 3, BIRD, CACTUS)  # choice(['cactus'] * 3 + ['bird'])
+        return kind, rng.choice(CACTUS_W, size=k), rng.choice(CACTUS_H, size=k), rng.choice(BIRD_ALT, size=k)
+
+    # ------------------------- Simulation ----------------------------------- #
+    def apply(self, actions: np.ndarray):
+        """Input before the tick, as DinoEnv.step applies it to a Game."""
+        jump = (actions == JUMP) & self.on_ground                       # Player.jump
+        self.vy = np.where(jump, np.where(self.ducking, JUMP_VELOCITY * 0.88, JUMP_VELOCITY * 1.0), self.vy)
+        self.on_ground &= ~jump
+        want = actions == DUCK
+        change = want != self.ducking                                    # Player.set_duck
+        duck = want & self.on_ground
+        self.y = np.where(change & duck, float(GROUND_Y - DUCK_HEIGHT),
+                          np.where(change & ~duck & self.on_ground, float(GROUND_Y - RUN_HEIGHT), self.y))
+        self.ducking = np.where(change, duck, self.ducking)
+
+    def update(self):
+        """One Game.update for every row."""
+        self.tick += 1
+        now = self.tick * STEP_MS
+
+        # update_speed
+        p = self.preset
+        self.distance += self.speed * 1.0
+        target = p['base_speed'] + np.minimum(p['ramp_cap'], self.distance / p['ramp_dist'])
+        speed = self.speed + (target - self.speed) * 0.02
+        speed += 0.07 * np.sin(self.distance / 240.0)
+        self.speed = np.clip(speed, p['min_speed'], p['max_speed'])
+        self.tick_speed = self.speed
+
+        # maybe_spawn (obstacles)
+        fire = np.flatnonzero(now - self.spawn_start >= self.spawn_dur)
+        if fire.size:
+            self.spawn(fire, now)
+
+        # Player.update
+        self.vy += GRAVITY * 1.0
+        self.y += self.vy
+        ground = np.where(self.ducking, float(GROUND_Y - DUCK_HEIGHT), float(GROUND_Y - RUN_HEIGHT))
+        landed = self.y >= ground
+        self.y = np.where(landed, ground, self.y)
+        self.vy = np.where(landed, 0.0, self.vy)
+        self.on_ground = landed
+
+        # Cactus/Bird.update
+        live = self.kind != EMPTY
+        self.ox -= self.tick_speed[:, None] * self.omul
+        bx = self.ox + self.bdx
+        gone = live & (self.ox + self.ow < 0)
+        self.kind[gone] = EMPTY
+        live &= ~gone
+
+        # check_collisions: the player hitbox against every obstacle box
+        h = np.where(self.ducking & self.on_ground, DUCK_HEIGHT, RUN_HEIGHT)
+        hx = (PLAYER_X - 14) + 2
+        hy = (self.y + 2)[:, None]
+        hh = (h - 4)[:, None]
+        hit = (live & (hx < bx + self.bw) & (hx + 24 > bx) &
+               (hy < self.by + self.bh) & (hy + hh > self.by)).any(axis=1)
+
+        self.score += (self.tick_speed * 0.2).astype(np.int64)
+        if hit.any():
+            self.finish(hit)
+
+    def spawn(self, rows: np.ndarray, now: float):
+        kind, cw, ch, alt = self.draw_obstacles(rows.size)
+        slot = self.tail[rows] % self.kind.shape[1]
+        if (self.kind[rows, slot] != EMPTY).any():
+            raise RuntimeError('obstacle ring buffer full; raise `slots`')
+        bird = kind == BIRD
+        self.kind[rows, slot] = kind
+        self.ox[rows, slot] = W + 20
+        self.ow[rows, slot] = np.where(bird, BIRD_W, cw)
+        self.omul[rows, slot] = np.where(bird, 1.15, 1.0)
+        # hitboxes: Cactus (x, y + 44 - h, w, h) with y = GROUND_Y - 35; Bird (x + 4, alt + 2, w - 8, h - 4)
+        self.bdx[rows, slot] = np.where(bird, 4, 0)
+        self.by[rows, slot] = np.where(bird, alt + 2, (GROUND_Y - 35) + (44 - ch))
+        self.bw[rows, slot] = np.where(bird, BIRD_W - 8, cw)
+        self.bh[rows, slot] = np.where(bird, BIRD_H - 4, ch)
+        self.tail[rows] += 1
+        self.spawn_start[rows] = now
+        self.spawn_dur[rows] = self.draw_interval(rows.size)
+
+    def finish(self, done: np.ndarray, truncated: bool = False):
+        """Record the runs in `done` rows and drop those rows."""
+        ids = self.ids[done]
+        self.survived[ids] = self.tick
+        self.final_score[ids] = self.score[done]
+        self.truncated[ids] = truncated
+        keep = ~done
+        for name in ('ids', 'y', 'vy', 'on_ground', 'ducking', 'speed', 'tick_speed', 'distance', 'score',
+                     'spawn_start', 'spawn_dur', 'ox', 'kind', 'ow', 'bdx', 'by', 'bw', 'bh', 'omul', 'tail'):
+            setattr(self, name, getattr(self, name)[keep])
+
+    @property
+    def rows(self) -> int:
+        return self.ids.size
+
+    def observe(self, n_obstacles: int = N_OBSTACLES) -> np.ndarray:
+        """Observations in the dino_env layout, one row per live run."""
+        rows = self.rows
+        out = np.zeros((rows, obs_size(n_obstacles)), dtype=np.float32)
+        out[:, 0], out[:, 1], out[:, 2] = self.y, self.vy, self.ducking
+        bx = self.ox + self.bdx
+        ahead = (self.kind != EMPTY) & (bx + self.bw > PLAYER_X - 14)
+        order = np.argsort(np.where(ahead, bx, np.inf), axis=1)[:, :n_obstacles]
+        r = np.arange(rows)[:, None]
+        valid = ahead[r, order]
+        fields = (self.kind[r, order] + 1.0, bx[r, order] - PLAYER_X, self.by[r, order],
+                  self.bw[r, order], self.bh[r, order])
+        for j, f in enumerate(fields):
+            out[:, OBS_PLAYER + j:OBS_PLAYER + OBS_OBSTACLE * n_obstacles:OBS_OBSTACLE] = np.where(valid, f, 0)
+        out[:, -3] = self.tick_speed
+        return out
+
+    def run(self, policy: Policy, max_ticks: int = 100000) -> Dict[str, np.ndarray]:
+        """Play every run to game over (or `max_ticks`, which truncates it)."""
+        while self.rows and self.tick < max_ticks:
+            self.apply(np.asarray(policy(self.observe())))
+            self.update()
+        if self.rows:
+            self.finish(np.ones(self.rows, dtype=bool), truncated=True)
+        return {'ticks': self.survived, 'score': self.final_score, 'truncated': self.truncated}
+
+
+# ------------------------------ Policies ------------------------------------ #
+
+def noop_policy(obs: np.ndarray) -> np.ndarray:
+    return np.full(len(obs), NOOP, dtype=np.int8)
+
+
+def make_random_policy(seed: int = 0, p_jump: float = 0.05) -> Policy:
+    rng = np.random.default_rng(seed)
+
+    def policy(obs: np.ndarray) -> np.ndarray:
+        return np.where(rng.random(len(obs)) < p_jump, JUMP, NOOP).astype(np.int8)
+    return policy
+
+
+def jumper_policy(obs: np.ndarray, lead: float = 9.0) -> np.ndarray:
+    """Jump when the nearest cactus is within `lead` ticks of scroll."""
+    kind, dx = obs[:, OBS_PLAYER], obs[:, OBS_PLAYER + 1]
+    speed = obs[:, -3]
+    jump = (kind == CACTUS + 1) & (dx > 0) & (dx < lead * speed)
+    return np.where(jump, JUMP, NOOP).astype(np.int8)
+
+
+POLICIES = {'noop': noop_policy, 'random': make_random_policy(), 'jumper': jumper_policy}
+
+
+def summarize(res: Dict[str, np.ndarray], bins: int = 20) -> Dict:
+    ticks, score = res['ticks'], res['score']
+    q = (5, 25, 50, 75, 95)
+    hist, edges = np.histogram(ticks, bins=bins)
+    return {
+        'episodes': int(ticks.size),
+        'truncated': int(res['truncated'].sum()),
+        'survival_ticks': {f'p{p}': float(v) for p, v in zip(q, np.percentile(ticks, q))},
+        'survival_mean': float(ticks.mean()),
+        'score': {f'p{p}': float(v) for p, v in zip(q, np.percentile(score, q))},
+        'score_mean': float(score.mean()),
+        'survival_hist': {'counts': hist.tolist(), 'edges': edges.tolist()},
+    }
+
+
+# ------------------------------ Verification -------------------------------- #
+
+class _GameDraws(BatchSim):
+    """A one-row BatchSim whose random draws are copied from a live Game."""
+
+    def __init__(self, game: Game, difficulty: int):
+        self.pending: List[tuple] = []
+        self.next_interval = float(game.next_obstacle.duration)
+        super().__init__(1, difficulty)
+
+    def draw_interval(self, k: int) -> np.ndarray:
+        return np.array([self.next_interval])
+
+    def draw_obstacles(self, k: int):
+        if len(self.pending) != k:
+            raise AssertionError(f'tick {self.tick}: batch spawned {k}, game spawned {len(self.pending)}')
+        kind, w, h, alt = zip(*self.pending)
+        self.pending.clear()
+        return np.array(kind), np.array(w), np.array(h), np.array(alt)
+
+
+def verify(ticks: int = 20000, difficulty: int = 2, seed: int = 0, policy: Policy = jumper_policy) -> int:
+    """Step a Game (pickups disabled) and a one-row BatchSim side by side,
+    feeding the batch the game's random draws, and assert that player,
+    speed, score and obstacle hitboxes match exactly after every tick.
+    Returns the number of ticks compared."""
+    env = DinoEnv(difficulty=difficulty, seed=seed)
+    env.reset()
+    g = env.game
+    g.next_coin.duration = g.next_power.duration = float('inf')
+    sim = _GameDraws(g, difficulty)
+    seen: set = set()  # the obstacles alive after the previous tick
+    for tick in range(1, ticks + 1):
+        obs = env.observe()[None, :]
+        action = int(policy(obs)[0])
+        env.step(action)
+        for o in g.obstacles:
+            if o not in seen:
+                if isinstance(o, Bird):
+                    sim.pending.append((BIRD, 0, 0, o.alt))
+                else:
+                    sim.pending.append((CACTUS, o.w, o.h, 0))
+        seen = set(g.obstacles)
+        sim.next_interval = float(g.next_obstacle.duration)
+        sim.apply(np.array([action]))
+        sim.update()
+        p = g.player
+        if g.game_over:
+            if sim.rows or sim.final_score[0] != g.score:
+                raise AssertionError(f'tick {tick}: game over in Game only (or score differs)')
+            return tick
+        mine = sorted((o.box.x, o.box.y, o.box.w, o.box.h) for o in g.obstacles)
+        live = sim.kind[0] != EMPTY
+        theirs = sorted(zip((sim.ox + sim.bdx)[0][live], sim.by[0][live], sim.bw[0][live], sim.bh[0][live]))
+        expect = (p.y, p.vy, p.on_ground, p.ducking, g.speed, g.distance, g.score, mine)
+        got = (sim.y[0], sim.vy[0], sim.on_ground[0], sim.ducking[0], sim.speed[0], sim.distance[0],
+               sim.score[0], theirs) if sim.rows else None
+        if got != expect:
+            raise AssertionError(f'tick {tick}: diverged\n  game  {expect}\n  batch {got}')
+    return ticks
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description='Batched Dino Runner simulator')
+    ap.add_argument('--episodes', type=int, default=10000)
+    ap.add_argument('--difficulty', type=int, default=2, choices=(1, 2, 3))
+    ap.add_argument('--policy', default='jumper', choices=sorted(POLICIES))
+    ap.add_argument('--max-ticks', type=int, default=20000)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--verify', type=int, metavar='TICKS',
+                    help='check the batch physics against Game for up to TICKS ticks per seed (10 seeds)')
+    args = ap.parse_args(argv)
+
+    if args.verify:
+        for seed in range(args.seed, args.seed + 10):
+            n = verify(args.verify, args.difficulty, seed, POLICIES[args.policy])
+            print(f'seed {seed}: identical for {n} ticks')
+        return 0
+
+    t0 = time.perf_counter()
+    sim = BatchSim(args.episodes, args.difficulty, args.seed)
+    res = sim.run(POLICIES[args.policy], args.max_ticks)
+    secs = time.perf_counter() - t0
+    s = summarize(res)
+    print(f"{s['episodes']} episodes, {int(res['ticks'].sum()):,} run-ticks in {secs:.2f}s "
+          f"({res['ticks'].sum() / secs:,.0f} run-ticks/s)")
+    print(f"survival ticks: mean {s['survival_mean']:.0f}, "
+          + ', '.join(f'{k} {v:.0f}' for k, v in s['survival_ticks'].items()))
+    print(f"score: mean {s['score_mean']:.0f}, " + ', '.join(f'{k} {v:.0f}' for k, v in s['score'].items()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
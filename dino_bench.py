@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the Dino Runner in tk_snake_game.py
+
+Every scenario drives a `Game` for a fixed number of ticks from a pinned
+random seed, with scripted input, and is measured three ways:
+
+- update: ticks/s of `Game.update` alone (headless)
+- draw:   frames/s of `TkView.draw` plus Tk's own redraw, one frame per tick
+          (needs a display; skipped and reported as null without one)
+- alloc:  bytes allocated per tick (tracemalloc transient peak)
+
+Run
+===
+python dino_bench.py                          # all scenarios -> bench_output.txt
+python dino_bench.py --quick --no-draw        # short headless smoke run
+python dino_bench.py --compare baseline.json  # exit 1 on regressions
+"""
+
+import sys
+import math
+import time
+import json
+import argparse
+import platform
+import tracemalloc
+from typing import Callable, List, Optional
+
+import tk_snake_game as dino
+from tk_snake_game import Game, TkView, Coin, ShieldPU
+
+DEFAULT_SEED = 1234
+DRAW_TICKS = 5000    # draw passes are capped; rendering 100k frames adds nothing
+ALLOC_TICKS = 5000   # tracemalloc slows every allocation, so cap this pass too
+OUT_FILE = 'bench_output.txt'
+
+# compare mode: higher is better for rates, lower for allocations
+METRICS = {'update_tps': +1, 'draw_fps': +1, 'alloc_bytes_per_tick': -1}
+ALLOC_SLACK = 64  # bytes/tick of noise tolerated before an allocation regression
+
+
+# ------------------------------ Scenarios ----------------------------------- #
+
+Script = Callable[[Game, int], None]
+
+
+def jump_every(n: int) -> Script:
+    def script(g: Game, tick: int):
+        if tick % n == 0:
+            g.press_jump()
+    return script
+
+
+def idle(g: Game, tick: int):
+    pass
+
+
+def particle_storm(g: Game, tick: int):
+    # collect a coin and a shield every few ticks, right where the player is
+    if tick % 4 == 0:
+        Coin(g, g.scroll_speed).collect()
+        ShieldPU(g, g.scroll_speed).collect()
+
+
+def night(g: Game, tick: int):
+    g.time_t = math.pi / 2  # hold the sky at full night, stars out
+    if tick % 45 == 0:
+        g.press_jump()
+
+
+class Scenario:
+    __slots__ = ('name', 'ticks', 'difficulty', 'script')
+
+    def __init__(self, name: str, ticks: int, difficulty: int, script: Script):
+        self.name = name
+        self.ticks = ticks
+        self.difficulty = difficulty
+        self.script = script
+
+
+SCENARIOS = [
+    Scenario('idle', 20000, 2, idle),
+    Scenario('hard', 20000, 3, jump_every(45)),
+    Scenario('storm', 20000, 2, particle_storm),
+    Scenario('night', 20000, 2, night),
+    Scenario('long', 100000, 2, jump_every(45)),
+]
+
+
+# ------------------------------ Runners ------------------------------------- #
+
+def new_game(sc: Scenario, seed: int) -> Game:
+    return Game(headless=True, difficulty=sc.difficulty, seed=seed)
+
+
+def step(g: Game, sc: Scenario, tick: int):
+    # a game over restarts straight away, as if R were pressed
+    if g.game_over:
+        g.restart()
+    sc.script(g, tick)
+    g.update(1.0)
+
+
+def bench_update(sc: Scenario, ticks: int, seed: int) -> float:
+    g = new_game(sc, seed)
+    t0 = time.perf_counter()
+    for tick in range(ticks):
+        step(g, sc, tick)
+    return ticks / max(time.perf_counter() - t0, 1e-9)
+
+
+def bench_alloc(sc: Scenario, ticks: int, seed: int) -> float:
+    g = new_game(sc, seed)
+    tracemalloc.start()
+    total = 0
+    for tick in range(ticks):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        step(g, sc, tick)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - before
+    tracemalloc.stop()
+    return total / max(1, ticks)
+
+
+def bench_draw(root, sc: Scenario, ticks: int, seed: int) -> float:
+    g = new_game(sc, seed)
+    view = TkView(root, g)
+    view.running = False  # frames are driven from here, not by root.after
+    spent = 0.0
+    for tick in range(ticks):
+        step(g, sc, tick)
+        t0 = time.perf_counter()
+        view.draw()
+        root.update_idletasks()  # make Tk actually repaint the canvas
+        spent += time.perf_counter() - t0
+    view.c.destroy()
+    return ticks / max(spent, 1e-9)
+
+
+def open_display():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:  # no tkinter, or no display to open
+        return None
+    root.geometry(f'{dino.W}x{dino.H}')
+    return root
+
+
+def run(scenarios: List[Scenario], seed: int, scale: float, draw: bool) -> dict:
+    root = open_display() if draw else None
+    results = {}
+    for sc in scenarios:
+        ticks = max(1, int(sc.ticks * scale))
+        res = {'ticks': ticks, 'difficulty': sc.difficulty}
+        res['update_tps'] = bench_update(sc, ticks, seed)
+        res['draw_fps'] = bench_draw(root, sc, min(ticks, DRAW_TICKS), seed) if root else None
+        res['alloc_bytes_per_tick'] = bench_alloc(sc, min(ticks, ALLOC_TICKS), seed)
+        results[sc.name] = res
+        draw_s = f"{res['draw_fps']:,.0f}" if res['draw_fps'] else '-'
+        print(f"{sc.name:<8} update {res['update_tps']:>10,.0f} ticks/s   draw {draw_s:>8} fps   "
+              f"alloc {res['alloc_bytes_per_tick']:>7.0f} B/tick", file=sys.stderr)
+    if root:
+        root.destroy()
+    return {
+        'seed': seed,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': dino.np is not None,
+        'scenarios': results,
+    }
+
+
+# ------------------------------ Compare ------------------------------------- #
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Return a line for every metric that got worse than `baseline` by more
+    than `threshold` (a fraction)."""
+    regressions = []
+    for name, res in current['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if not base:
+            continue
+        for metric, sign in METRICS.items():
+            new, old = res.get(metric), base.get(metric)
+            if not new or not old:
+                continue
+            if sign > 0:
+                worse = new < old * (1 - threshold)
+            else:
+                worse = new > old * (1 + threshold) + ALLOC_SLACK
+            if worse:
+                regressions.append(f"{name}.{metric}: {old:,.1f} -> {new:,.1f} ({(new - old) / old:+.1%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description='Dino Runner benchmarks')
+    ap.add_argument('--scenario', action='append', choices=[s.name for s in SCENARIOS],
+                    help='run only this scenario (repeatable)')
+    ap.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    ap.add_argument('--quick', action='store_true', help='run a tenth of the ticks')
+    ap.add_argument('--no-draw', action='store_true', help='skip the Tk draw pass')
+    ap.add_argument('--out', default=OUT_FILE, help=f'JSON results file (default {OUT_FILE})')
+    ap.add_argument('--compare', metavar='BASELINE', help='flag regressions against a previous results file')
+    ap.add_argument('--threshold', type=float, default=0.10,
+                    help='relative change treated as a regression (default 0.10)')
+    args = ap.parse_args(argv)
+
+    chosen = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    results = run(chosen, args.seed, 0.1 if args.quick else 1.0, not args.no_draw)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print('REGRESSION', line)
+        if regressions:
+            return 1
+        print(f'no regressions against {args.compare}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
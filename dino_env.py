@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reinforcement-learning environments over the Dino Runner simulation
+
+`DinoEnv` wraps one headless `Game` behind a Gymnasium-style API
+(reset/step, discrete actions, NumPy observations) without depending on
+gym itself. `VecDinoEnv` runs many of them across worker processes; the
+observations, actions, rewards and done flags live in shared memory, so
+a step costs one tiny pipe message per worker and no pickling of arrays.
+
+Observation (float32, OBS_SIZE = 3 + 5 * n_obstacles + 3):
+    player y, player vy, ducking,
+    n_obstacles x (kind, x - PLAYER_X, y, w, h) of the nearest obstacles
+    ahead, nearest first (kind 0 = empty slot, 1 = cactus, 2 = bird; the
+    box is the obstacle hitbox),
+    scroll speed this tick, shield active, slowmo active
+
+Actions: NOOP, JUMP, DUCK (duck is held while the action is repeated).
+Reward: score gained during the step; the episode terminates on game over.
+
+Run
+===
+python dino_env.py              # random-policy smoke test, single and vectorised
+"""
+
+import sys
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tk_snake_game import Game, Bird, PLAYER_X
+
+NOOP, JUMP, DUCK = range(3)
+N_ACTIONS = 3
+N_OBSTACLES = 3  # obstacles described in each observation
+OBS_PLAYER, OBS_OBSTACLE, OBS_TAIL = 3, 5, 3
+
+
+def obs_size(n_obstacles: int = N_OBSTACLES) -> int:
+    return OBS_PLAYER + OBS_OBSTACLE * n_obstacles + OBS_TAIL
+
+
+class DinoEnv:
+    """A single headless game with a reset/step interface.
+
+    `reset(seed)` starts a fresh game from that seed; without one, the next
+    run continues the current game's random stream, so an env created with
+    a seed yields the same sequence of episodes every time.
+    """
+
+    def __init__(self, difficulty: int = 2, seed: Optional[int] = None,
+                 n_obstacles: int = N_OBSTACLES, max_ticks: Optional[int] = None):
+        self.difficulty = difficulty
+        self.seed = seed
+        self.n_obstacles = n_obstacles
+        self.max_ticks = max_ticks  # truncate episodes after this many ticks
+        self.observation_shape = (obs_size(n_obstacles),)
+        self.n_actions = N_ACTIONS
+        self.game: Optional[Game] = None
+        self.ticks = 0
+        self.ahead: List[Tuple[float, object]] = []  # reused obstacle sort buffer
+
+    def reset(self, seed: Optional[int] = None, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict]:
+        if seed is not None or self.game is None:
+            self.game = Game(headless=True, difficulty=self.difficulty,
+                             seed=seed if seed is not None else self.seed)
+        else:
+            self.game.restart()
+        self.ticks = 0
+        return self.observe(out), {'seed': self.game.seed}
+
+    def step(self, action: int, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float, bool, bool, Dict]:
+        g = self.game
+        p = g.player
+        if action == JUMP:
+            g.press_jump()
+        if (action == DUCK) != p.ducking:
+            g.set_duck(action == DUCK)
+        score = g.score
+        g.update(1.0)
+        self.ticks += 1
+        terminated = g.game_over
+        truncated = not terminated and self.max_ticks is not None and self.ticks >= self.max_ticks
+        return self.observe(out), float(g.score - score), terminated, truncated, {'score': g.score}
+
+    def observe(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Write the observation into `out` (allocated if None) and return it."""
+        if out is None:
+            out = np.zeros(self.observation_shape, dtype=np.float32)
+        g = self.game
+        p = g.player
+        out[0], out[1], out[2] = p.y, p.vy, p.ducking
+        # nearest obstacles whose hitbox has not yet passed the player
+        left = p.box.x
+        ahead = self.ahead
+        ahead.clear()
+        for o in g.obstacles:
+            b = o.box
+            if b.x + b.w > left:
+                ahead.append((b.x, o))
+        ahead.sort(key=lambda t: t[0])
+        k = OBS_PLAYER
+        for i in range(self.n_obstacles):
+            if i < len(ahead):
+                o = ahead[i][1]
+                b = o.box
+                out[k:k + OBS_OBSTACLE] = (2 if isinstance(o, Bird) else 1, b.x - PLAYER_X, b.y, b.w, b.h)
+            else:
+                out[k:k + OBS_OBSTACLE] = 0
+            k += OBS_OBSTACLE
+        out[k], out[k + 1], out[k + 2] = g.tick_speed, p.shield, g.slowmo_on
+        return out
+
+
+# ------------------------------ Vectorised ---------------------------------- #
+
+def _attach(name: str, shape: tuple, dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _worker(conn, names: Dict[str, str], n: int, lo: int, hi: int, kwargs: dict, seed: int):
+    """Owns envs [lo, hi) of a VecDinoEnv; steps them on each 'step' message."""
+    size = obs_size(kwargs['n_obstacles'])
+    blocks = [
+        _attach(names['obs'], (n, size), np.float32),
+        _attach(names['act'], (n,), np.int8),
+        _attach(names['rew'], (n,), np.float64),
+        _attach(names['done'], (n, 2), np.bool_),
+        _attach(names['score'], (n,), np.int64),
+    ]
+    obs, act, rew, done, score = (a for _, a in blocks)
+    envs = [DinoEnv(seed=seed + i, **kwargs) for i in range(lo, hi)]
+    try:
+        while True:
+            cmd = conn.recv()
+            if cmd == 'step':
+                for i, env in enumerate(envs, lo):
+                    _, r, term, trunc, info = env.step(int(act[i]), out=obs[i])
+                    rew[i] = r
+                    done[i] = (term, trunc)
+                    score[i] = info['score']
+                    if term or trunc:
+                        env.reset(out=obs[i])  # autoreset; obs[i] starts the next episode
+            elif cmd == 'reset':
+                for i, env in enumerate(envs, lo):
+                    env.reset(seed=seed + i, out=obs[i])
+                    done[i] = False
+            else:
+                break
+            conn.send(True)
+    finally:
+        del obs, act, rew, done, score
+        for shm, _ in blocks:
+            shm.close()
+
+
+class VecDinoEnv:
+    """`num_envs` DinoEnvs split across `workers` processes.
+
+    Observations, actions, rewards, terminated/truncated flags and scores
+    are arrays in shared memory; `step` writes the actions, wakes every
+    worker and waits for all of them. Finished episodes reset automatically,
+    so the observation returned for such an env is the first of its next
+    episode, and `scores` holds the final score of the one that ended.
+    """
+
+    def __init__(self, num_envs: int, difficulty: int = 2, seed: int = 0, workers: Optional[int] = None,
+                 n_obstacles: int = N_OBSTACLES, max_ticks: Optional[int] = None):
+        self.num_envs = num_envs
+        self.observation_shape = (num_envs, obs_size(n_obstacles))
+        self.n_actions = N_ACTIONS
+        workers = max(1, min(workers or mp.cpu_count(), num_envs))
+
+        self.shm: List[shared_memory.SharedMemory] = []
+        self.obs = self._alloc(self.observation_shape, np.float32)
+        self.actions = self._alloc((num_envs,), np.int8)
+        self.rewards = self._alloc((num_envs,), np.float64)
+        self.dones = self._alloc((num_envs, 2), np.bool_)
+        self.scores = self._alloc((num_envs,), np.int64)
+        names = dict(zip(('obs', 'act', 'rew', 'done', 'score'), (s.name for s in self.shm)))
+
+        kwargs = {'difficulty': difficulty, 'n_obstacles': n_obstacles, 'max_ticks': max_ticks}
+        self.conns = []
+        self.procs = []
+        bounds = np.linspace(0, num_envs, workers + 1).astype(int)
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            parent, child = mp.Pipe()
+            proc = mp.Process(target=_worker, args=(child, names, num_envs, int(lo), int(hi), kwargs, seed),
+                              daemon=True)
+            proc.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(proc)
+        self.closed = False
+
+    def _alloc(self, shape: tuple, dtype) -> np.ndarray:
+        nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.shm.append(shm)
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        arr[...] = 0
+        return arr
+
+    def _broadcast(self, cmd: str):
+        for conn in self.conns:
+            conn.send(cmd)
+        for conn in self.conns:
+            conn.recv()
+
+    def reset(self) -> np.ndarray:
+        """Reset every env to its own seed; returns the shared observation
+        array (copy it to keep it past the next step)."""
+        self._broadcast('reset')
+        return self.obs
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        self.actions[:] = actions
+        self._broadcast('step')
+        return self.obs, self.rewards, self.dones[:, 0], self.dones[:, 1], {'score': self.scores}
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self.conns:
+            try:
+                conn.send('close')
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self.procs:
+            proc.join(timeout=5)
+        # drop our views before releasing the blocks they point into
+        del self.obs, self.actions, self.rewards, self.dones, self.scores
+        for shm in self.shm:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self) -> 'VecDinoEnv':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description='Dino Runner environment smoke test (random policy)')
+    ap.add_argument('--envs', type=int, default=64)
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--steps', type=int, default=2000)
+    args = ap.parse_args(argv)
+    rng = np.random.default_rng(0)
+
+    env = DinoEnv(seed=0)
+    env.reset()
+    t0 = time.perf_counter()
+    episodes = 0
+    for _ in range(args.steps):
+        _, _, term, trunc, _ = env.step(int(rng.integers(N_ACTIONS)))
+        if term or trunc:
+            episodes += 1
+            env.reset()
+    secs = time.perf_counter() - t0
+    print(f"single: {args.steps / secs:,.0f} steps/s, {episodes} episodes")
+
+    with VecDinoEnv(args.envs, seed=0, workers=args.workers) as venv:
+        venv.reset()
+        t0 = time.perf_counter()
+        episodes = 0
+        for _ in range(args.steps):
+            _, _, term, trunc, _ = venv.step(rng.integers(N_ACTIONS, size=args.envs))
+            episodes += int(term.sum() + trunc.sum())
+        secs = time.perf_counter() - t0
+        print(f"vector: {args.envs} envs x {len(venv.procs)} workers: "
+              f"{args.steps * args.envs / secs:,.0f} steps/s, {episodes} episodes")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
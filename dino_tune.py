@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo difficulty tuner for DIFF_PRESETS and the speed ramp
+
+For each difficulty, sweeps a grid of preset parameters (base_speed,
+obs_min, the obs_min..obs_max spread and the speed-ramp distance). Each
+grid point runs a population of scripted bots in `dino_batch.BatchSim`,
+one task per (grid point, seed), fanned out over a process pool. Survival
+and score histograms are merged per grid point and the survival curve
+is compared with a target curve for that difficulty.
+
+The best point is recommended. Each parameter's confidence interval is
+the range it spans over every grid point whose loss is within the
+best point's own 95% interval (the spread across seeds). Grid points
+outside that set are measurably worse; points inside it cannot be told
+apart from the best with this many runs.
+
+Coins and power-ups are not simulated by BatchSim, so coin_min/coin_max
+are carried over unchanged.
+
+Run
+===
+python dino_tune.py                    # all difficulties, full grid -> dino_tune.json
+python dino_tune.py --quick -d 2       # small grid, few runs
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tk_snake_game import DIFF_PRESETS, FPS, SPEED_RAMP_DIST
+from dino_env import NOOP, JUMP, OBS_PLAYER
+from dino_batch import BatchSim, CACTUS
+
+MAX_SECONDS = 120  # runs are truncated here; the target curves stop earlier
+HIST_BINS = np.arange(0, MAX_SECONDS * FPS + FPS, 5 * FPS)  # survival histogram, 5 s bins
+SCORE_BINS = np.arange(0, 40001, 1000)
+
+# Target share of the bot population still alive after t seconds (replace
+# with curves measured from real players when available)
+TARGETS: Dict[int, Dict[int, float]] = {
+    1: {10: 0.95, 30: 0.75, 60: 0.45, 90: 0.25},
+    2: {10: 0.90, 30: 0.60, 60: 0.30, 90: 0.15},
+    3: {10: 0.80, 30: 0.45, 60: 0.20, 90: 0.08},
+}
+
+# Sweep values, relative to the current preset where that makes sense
+GRID = {
+    'base_speed': (-1.0, -0.5, 0.0, 0.5, 1.0),
+    'obs_min': (-150, -75, 0, 75, 150),
+    'obs_spread': (300, 500, 700),
+    'ramp_dist': (1200.0, 1800.0, 2400.0),
+}
+QUICK_GRID = {
+    'base_speed': (-0.5, 0.0, 0.5),
+    'obs_min': (-100, 0, 100),
+    'obs_spread': (500,),
+    'ramp_dist': (SPEED_RAMP_DIST,),
+}
+
+
+# ------------------------------ Bot population ------------------------------ #
+
+class BotPopulation:
+    """Cactus-jumping bots of varied skill, one per run of a BatchSim.
+
+    Each bot has a lead (how many ticks of scroll ahead it starts looking
+    to jump) and a per-tick chance of reacting once a cactus is inside
+    that lead. Slow reactions jump too late and crash, mostly when
+    obstacles come close together; birds only fly into bots that are
+    already in the air.
+    """
+
+    def __init__(self, sim: BatchSim, seed: int):
+        rng = np.random.default_rng(seed)
+        self.sim = sim
+        self.lead = rng.uniform(8.0, 12.0, size=sim.n)
+        self.react = rng.uniform(0.3, 0.6, size=sim.n)
+        self.rng = rng
+
+    def __call__(self, obs: np.ndarray) -> np.ndarray:
+        ids = self.sim.ids
+        kind, dx, speed = obs[:, OBS_PLAYER], obs[:, OBS_PLAYER + 1], obs[:, -3]
+        near = (kind == CACTUS + 1) & (dx > 0) & (dx < self.lead[ids] * speed)
+        jump = near & (self.rng.random(len(obs)) < self.react[ids])
+        return np.where(jump, JUMP, NOOP).astype(np.int8)
+
+
+# ------------------------------ Tasks --------------------------------------- #
+
+def make_preset(difficulty: int, point: Dict[str, float]) -> Dict:
+    cur = DIFF_PRESETS[difficulty]
+    obs_min = int(cur['obs_min'] + point['obs_min'])
+    return {
+        'base_speed': round(cur['base_speed'] + point['base_speed'], 2),
+        'obs_min': obs_min,
+        'obs_max': obs_min + int(point['obs_spread']),
+        'coin_min': cur['coin_min'],
+        'coin_max': cur['coin_max'],
+        'ramp_dist': float(point['ramp_dist']),
+    }
+
+
+def run_task(args: Tuple[int, Dict, int, int]) -> Dict:
+    """One (preset, seed) batch of bot runs; returns mergeable histograms."""
+    difficulty, preset, seed, episodes = args
+    sim = BatchSim(episodes, difficulty, seed=seed, preset=preset)
+    res = sim.run(BotPopulation(sim, seed + 1_000_003), max_ticks=MAX_SECONDS * FPS)
+    ticks = res['ticks']
+    return {
+        'survival_hist': np.histogram(ticks, bins=HIST_BINS)[0],
+        'score_hist': np.histogram(res['score'], bins=SCORE_BINS)[0],
+        'survival': {t: float((ticks > t * FPS).mean()) for t in TARGETS[difficulty]},
+        'episodes': int(ticks.size),
+    }
+
+
+def loss(survival: Dict[int, float], target: Dict[int, float]) -> float:
+    return float(sum((survival[t] - s) ** 2 for t, s in target.items()))
+
+
+def tune(difficulty: int, grid: Dict[str, tuple], seeds: int, episodes: int,
+         pool: ProcessPoolExecutor, workers: int) -> Dict:
+    names = list(grid)
+    points = [dict(zip(names, vals)) for vals in itertools.product(*(grid[n] for n in names))]
+    presets = [make_preset(difficulty, pt) for pt in points]
+    tasks = [(difficulty, pr, seed, episodes) for pr in presets for seed in range(seeds)]
+    results = list(pool.map(run_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    target = TARGETS[difficulty]
+    rows = []
+    for i, preset in enumerate(presets):
+        parts = results[i * seeds:(i + 1) * seeds]
+        losses = np.array([loss(r['survival'], target) for r in parts])
+        mean = float(losses.mean())
+        half = float(1.96 * losses.std(ddof=1) / np.sqrt(seeds))  # seeds >= 2, see main
+        rows.append({
+            'preset': preset,
+            'loss': mean,
+            'loss_ci': half,
+            'survival': {t: float(np.mean([r['survival'][t] for r in parts])) for t in target},
+            'survival_hist': sum(r['survival_hist'] for r in parts).tolist(),
+            'score_hist': sum(r['score_hist'] for r in parts).tolist(),
+            'episodes': sum(r['episodes'] for r in parts),
+        })
+    rows.sort(key=lambda r: r['loss'])
+    best = rows[0]
+    # every point statistically tied with the best bounds the parameter ranges
+    tied = [r for r in rows if r['loss'] - r['loss_ci'] <= best['loss'] + best['loss_ci']]
+    ci = {k: [min(r['preset'][k] for r in tied), max(r['preset'][k] for r in tied)]
+          for k in ('base_speed', 'obs_min', 'obs_max', 'ramp_dist')}
+    return {
+        'difficulty': difficulty,
+        'target': target,
+        'current': DIFF_PRESETS[difficulty],
+        'recommended': best['preset'],
+        'confidence': ci,
+        'tied_points': len(tied),
+        'best': best,
+        'grid': [{k: r[k] for k in ('preset', 'loss', 'loss_ci', 'survival')} for r in rows],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description='Monte Carlo tuner for DIFF_PRESETS')
+    ap.add_argument('-d', '--difficulty', type=int, action='append', choices=(1, 2, 3))
+    ap.add_argument('--seeds', type=int,
+                    help='tasks (independent seeds) per grid point, at least 2 (default 4, 2 with --quick)')
+    ap.add_argument('--episodes', type=int, help='bot runs per task (default 400, 300 with --quick)')
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--quick', action='store_true', help='small grid, fewer seeds and runs')
+    ap.add_argument('--out', default='dino_tune.json')
+    args = ap.parse_args(argv)
+
+    grid = QUICK_GRID if args.quick else GRID
+    # --quick only changes the defaults; explicit --seeds/--episodes still win
+    seeds = (2 if args.quick else 4) if args.seeds is None else args.seeds
+    episodes = (300 if args.quick else 400) if args.episodes is None else args.episodes
+    if seeds < 2:
+        ap.error('--seeds must be at least 2: the confidence intervals come from the spread across seeds')
+    if episodes < 1:
+        ap.error('--episodes must be at least 1')
+    report = {'grid': grid, 'seeds': seeds, 'episodes_per_task': episodes, 'max_seconds': MAX_SECONDS,
+              'difficulties': {}}
+    t0 = time.perf_counter()
+    workers = args.workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        for d in args.difficulty or (1, 2, 3):
+            res = tune(d, grid, seeds, episodes, pool, workers)
+            report['difficulties'][d] = res
+            rec, ci = res['recommended'], res['confidence']
+            print(f"difficulty {d}: loss {res['best']['loss']:.4f} (+/- {res['best']['loss_ci']:.4f}), "
+                  f"{res['tied_points']} tied point(s)")
+            for k in ('base_speed', 'obs_min', 'obs_max', 'ramp_dist'):
+                print(f"  {k:<10} {rec[k]:>8}   [{ci[k][0]} .. {ci[k][1]}]   (now {res['current'].get(k, SPEED_RAMP_DIST)})")
+            print('  survival ' + ', '.join(f'{t}s {s:.2f} (target {res["target"][t]:.2f})'
+                                          for t, s in res['best']['survival'].items()))
+    print(f"done in {time.perf_counter() - t0:.0f}s; full report in {args.out}")
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
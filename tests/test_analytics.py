@@ -0,0 +1,63 @@
+"""Telemetry analytics: rates are counted against the right denominators."""
+
+import re
+
+import numpy as np
+
+import dino_analytics as da
+import tk_snake_game as dino
+
+
+def write_log(path, rows):
+    recs = np.array(rows, dtype=da.RECORD)
+    with open(path, 'wb') as f:
+        f.write(dino.TM_MAGIC + bytes([dino.TM_RECORD.size]))
+        f.write(recs.tobytes())
+
+
+def synthetic_rows():
+    rows = [(0, dino.TM_RUN, 2, 1, 0.0, 0.0)]
+    for k in range(60):
+        # speed ramps while coins are in flight, and some are collected in
+        # the next speed band and the next time-into-run bin
+        spawn, speed = 560 + k * 5, 8.0 + k * 0.12
+        rows.append((spawn, dino.TM_COIN_SPAWN, 0, 1, speed, 200.0))
+        if k % 3:
+            rows.append((spawn + 30, dino.TM_COIN, 0, 1, speed, 30.0))
+        if k % 4 == 0:
+            rows.append((spawn, dino.TM_SPAWN, k % da.VARIANTS, 1, speed, 200.0))
+    rows.append((900, dino.TM_DEATH, 4, 1, 15.2, 500.0))
+    rows.sort(key=lambda r: r[0])
+    return rows
+
+
+def assert_rates_at_most_one(tally):
+    c = tally.counts
+    assert (c['coins'] <= c['coin_spawns']).all()
+    assert (c['coins_t'] <= c['coin_spawns_t']).all()
+    assert (c['deaths'].sum(axis=2) <= c['spawns'].sum(axis=2)).all()
+    lines = da.report(tally, [1, 2, 3])
+    rates = [float(p) for line in lines for p in re.findall(r'(\d+(?:\.\d+)?)%', line)]
+    assert rates and max(rates) <= 100
+
+
+def test_synthetic_log_rates(tmp_path):
+    path = tmp_path / 'tm.bin'
+    write_log(path, synthetic_rows())
+    tally = da.analyse_file((str(path), 7))  # tiny chunks: state carries across them
+
+    c = tally.counts
+    assert c['coin_spawns'][1].sum() == 60 and c['coins'][1].sum() == 40
+    assert c['coins_t'][1].sum() == 40
+    assert_rates_at_most_one(tally)
+
+
+def test_game_log_rates(tmp_path):
+    path = str(tmp_path / 'tm.bin')
+    tm = dino.Telemetry(path)
+    dino.run_headless(20000, difficulty=2, seed=5, autopilot=True, telemetry=tm)
+    tm.close()
+
+    tally = da.analyse_file((path, da.CHUNK_RECORDS))
+    assert tally.counts['coins'].sum() > 0
+    assert_rates_at_most_one(tally)
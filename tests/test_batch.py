@@ -0,0 +1,12 @@
+"""Batched simulator: its physics match Game tick for tick."""
+
+import pytest
+
+import dino_batch
+
+
+@pytest.mark.parametrize('difficulty', [1, 2, 3])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_batch_matches_game(difficulty, seed):
+    # raises AssertionError on the first tick that diverges
+    assert dino_batch.verify(3000, difficulty=difficulty, seed=seed) > 0
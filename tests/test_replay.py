@@ -0,0 +1,64 @@
+"""Input logs: a recorded game replays to the same final state."""
+
+import pytest
+
+import tk_snake_game as dino
+
+
+def play(seed, ticks):
+    game = dino.Game(headless=True, difficulty=1, seed=seed)
+    log = game.recorder = dino.InputLog(game.seed, game.diff)
+    for t in range(ticks):
+        if game.game_over and t % 7 == 0:
+            game.press_restart()
+        if t % 37 == 0:
+            game.press_jump()
+        if t % 150 == 60:
+            game.set_duck(True)
+        if t % 150 == 75:
+            game.set_duck(False)
+        if t in (400, 1900):
+            game.toggle_pause()
+        if t in (460, 2000):
+            game.toggle_pause()
+        if t == 900:
+            game.set_difficulty(3)
+        if t == 2500:
+            game.press_restart()
+        game.update(1.0)
+    log.finish(game)
+    return game, log
+
+
+def test_round_trip_replays_to_the_recorded_state():
+    game, log = play(seed=20240, ticks=4000)
+    codes = set(log.codes)
+    assert {dino.EV_JUMP, dino.EV_DUCK, dino.EV_STAND, dino.EV_PAUSE,
+            dino.EV_RESTART, dino.EV_DIFFICULTY | 3} <= codes
+
+    loaded = dino.InputLog.from_bytes(log.to_bytes())
+    assert (list(loaded.ticks), bytes(loaded.codes)) == (list(log.ticks), bytes(log.codes))
+    assert (loaded.end_tick, loaded.score, loaded.digest) == (game.clock.ticks, game.score, game.state_hash())
+
+    again = dino.replay(loaded)
+    assert again.state_hash() == log.digest
+    assert again.score == log.score
+
+
+def test_varint_deltas():
+    log = dino.InputLog(dino.SEED_RANGE - 1, 2)
+    # deltas of 0, and ones needing 1, 2, 3 and 5 varint bytes
+    for tick in (0, 0, 127, 128 + 127, 16384 + 255, 2 ** 32 + 16639):
+        log.add(tick, dino.EV_JUMP)
+    log.end_tick = 2 ** 32 + 20000
+    loaded = dino.InputLog.from_bytes(log.to_bytes())
+    assert list(loaded.ticks) == list(log.ticks)
+    assert (loaded.seed, loaded.end_tick) == (log.seed, log.end_tick)
+
+
+@pytest.mark.parametrize('seed', [-1, dino.SEED_RANGE])
+def test_out_of_range_seed_is_rejected(seed):
+    with pytest.raises(ValueError):
+        dino.Game(headless=True, seed=seed)
+    with pytest.raises(SystemExit):
+        dino.main(['--seed', str(seed), '--headless', '10'])
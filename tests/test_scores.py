@@ -0,0 +1,24 @@
+"""Score store: the legacy high score is carried over."""
+
+import json
+
+import pytest
+
+import tk_snake_game as dino
+
+
+@pytest.mark.parametrize('sqlite', [True, False])
+def test_legacy_high_score_is_readable_at_once(tmp_path, monkeypatch, sqlite):
+    legacy = tmp_path / 'dino_highscore.json'
+    legacy.write_text(json.dumps({'high': 363}))
+    monkeypatch.setattr(dino, 'HS_FILE', str(legacy))
+    if not sqlite:
+        monkeypatch.setattr(dino, 'sqlite3', None)
+
+    store = dino.open_store(str(tmp_path / 'scores'))
+    try:
+        assert [r.score for r in store.top(2)] == [363]
+        assert [r.cause for r in store.recent()] == ['imported']
+        assert store.best(2) == 363
+    finally:
+        store.close()
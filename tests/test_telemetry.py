@@ -0,0 +1,36 @@
+"""Telemetry ring: records reach the file whole and in order."""
+
+import types
+
+import tk_snake_game as dino
+
+
+def emit_all(tm, n):
+    clock = tm.clock = types.SimpleNamespace(ticks=0)
+    for i in range(n):
+        clock.ticks = i
+        tm.emit(dino.TM_SPAWN, i & 0xFF, float(i))
+    tm.close()
+
+
+def test_drop_oldest_keeps_order_under_concurrent_emits(tmp_path, monkeypatch):
+    monkeypatch.setattr(dino, 'TM_FLUSH_S', 0.0001)  # take() as often as it can
+    path = str(tmp_path / 'tm.bin')
+    tm = dino.Telemetry(path, capacity=64, drop_oldest=True)
+    n = 300_000
+    emit_all(tm, n)
+
+    ticks = [r['tick'] for r in dino.read_telemetry(path)]
+    assert all(a < b for a, b in zip(ticks, ticks[1:]))
+    assert all(r['arg'] == r['tick'] & 0xFF and r['a'] == r['tick'] for r in dino.read_telemetry(path))
+    assert len(ticks) + tm.dropped == n
+
+
+def test_lossless_writes_every_record(tmp_path, monkeypatch):
+    monkeypatch.setattr(dino, 'TM_FLUSH_S', 0.0001)
+    path = str(tmp_path / 'tm.bin')
+    tm = dino.Telemetry(path, capacity=64)
+    emit_all(tm, 50_000)
+
+    assert [r['tick'] for r in dino.read_telemetry(path)] == list(range(50_000))
+    assert tm.dropped == 0
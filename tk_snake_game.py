@@ -13,24 +13,35 @@ Features
 - Particles: Dust, landing poofs, collision sparks
 - Clouds and parallax ground for depth
 - Day/Night cycle with sky tint and stars
-- Scoring, high-score persistence (local file), and difficulty scaling
+- Scoring, per-difficulty leaderboards and run history (SQLite, see ScoreStore),
+  and difficulty scaling
 - Pause/Resume, Game Over, Restart, and Settings overlay
 - Keyboard Controls: 
     * Space/Up = Jump, Down = Duck
     * P = Pause, R = Restart, M = Mute SFX (synthetic beeps)
     * 1/2/3 = Difficulty presets, C = Toggle color mode
-    * F1 = Show/Hide Debug HUD
+    * F1 = Show/Hide Debug HUD, A = Autopilot (plays by itself)
+    * F2 = Allocation profiler on/off (off writes dino_alloc.json)
+    * F4 = cProfile the next 300 ticks (dino_calls.pstats, dino_calls.folded)
+- Headless simulation mode (`Game` has no Tk dependency; `TkView` renders it)
 - Modular architecture, readable methods, and plenty of comments
 
 Notes
 =====
 - The game avoids external images/sounds; everything is drawn with Canvas shapes.
-- Sound effects are optional (simple `winsound.Beep` on Windows; noop on others).
+- Sound effects are synthesised tones played on a worker thread (winsound on
+  Windows, aplay where installed, silent otherwise); see `Audio`.
 - The code aims for clarity and breadth; performance is good for typical laptop screens.
 
 Run
 ===
-python dino_runner.py
+python tk_snake_game.py
+python tk_snake_game.py --headless 100000   # simulation only, no Tk/display
+python tk_snake_game.py --record run.dino   # play, then save the input log
+python tk_snake_game.py --replay run.dino   # re-run it headlessly and verify
+python tk_snake_game.py --headless 1000000 --autopilot   # soak run
+python tk_snake_game.py --scores             # leaderboards and recent runs
+python tk_snake_game.py --telemetry run.jsonl   # log gameplay events
 
 """
 from __future__ import annotations
@@ -40,17 +51,44 @@ import math
 import time
 import random
 import json
+import argparse
 import platform
-from dataclasses import dataclass, field
-from typing import List, Tuple, Optional, Callable, Dict
+import tracemalloc
+import struct
+import hashlib
+import cProfile
+import pstats
+import inspect
+import linecache
+import io
+import wave
+import queue
+import shutil
+import threading
+import subprocess
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Tuple, Optional, Callable, Dict
+
+# tkinter is only imported by the Tk front-end (TkView / main), so the
+# simulation can run headless on machines without a display.
+if TYPE_CHECKING:  # pragma: no cover
+    import tkinter as tk
 
+# Optional NumPy: vectorised particle updates (falls back to plain loops)
 try:
-    import tkinter as tk
-    from tkinter import ttk
-except Exception as e:  # pragma: no cover
-    raise
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Optional SQLite for the score store (falls back to a JSON file, see open_store)
+try:
+    import sqlite3
+except ImportError:  # pragma: no cover
+    sqlite3 = None
 
-# Optional simple beep on Windows
+# Optional Windows sound output (see WinsoundSink)
 WINDOWS = platform.system().lower().startswith('win')
 if WINDOWS:
     try:
@@ -69,17 +107,37 @@ def clamp(v: float, lo: float, hi: float) -> float:
 def lerp(a: float, b: float, t: float) -> float:
     return a + (b - a) * t
 
+# ------------------------------ Color Utils -------------------------------- #
 
-def now_ms() -> int:
-    return int(time.time() * 1000)
+def hex_to_rgb(hx: str) -> Tuple[int, int, int]:
+    hx = hx.lstrip('#')
+    return tuple(int(hx[i:i+2], 16) for i in (0, 2, 4))  # type: ignore
 
 
-def beep(freq: int = 440, dur: int = 80):
-    if winsound is not None:
-        try:
-            winsound.Beep(freq, dur)
-        except Exception:
-            pass
+def rgb_to_hex(r: int, g: int, b: int) -> str:
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def blend_hex(a: str, b: str, t: float) -> str:
+    ar, ag, ab = hex_to_rgb(a)
+    br, bg, bb = hex_to_rgb(b)
+    r = int(lerp(ar, br, t))
+    g = int(lerp(ag, bg, t))
+    b = int(lerp(ab, bb, t))
+    return rgb_to_hex(r, g, b)
+
+
+def invert_hex(h: str) -> str:
+    r, g, b = hex_to_rgb(h)
+    return rgb_to_hex(255 - r, 255 - g, 255 - b)
+
+
+def hex_mix_ratio(a: str, b: str) -> float:
+    # return rough similarity of a to b (0..1 where 1 means equal to b)
+    ar, ag, ab = hex_to_rgb(a)
+    br, bg, bb = hex_to_rgb(b)
+    da = abs(ar - br) + abs(ag - bg) + abs(ab - bb)
+    return 1.0 - clamp(da / (255*3), 0.0, 1.0)
 
 # ------------------------------ Constants ---------------------------------- #
 
@@ -87,7 +145,8 @@ W = 900
 H = 300
 GROUND_Y = 240
 FPS = 60
-DT_MS = int(1000 / FPS)
+STEP_MS = 1000.0 / FPS   # fixed simulation timestep
+MAX_CATCHUP_STEPS = 5    # at most this many ticks per frame before dropping time
 GRAVITY = 0.75
 JUMP_VELOCITY = -12.5
 DUCK_HEIGHT = 26
@@ -111,6 +170,40 @@ TEXT_COLOR = '#111111'
 TEXT_INV = '#f7f7f7'
 STAR_COLOR = '#cddbff'
 
+# Canvas layers, bottom to top. Every persistent item carries its layer tag;
+# items that scroll 1:1 with the ground also carry WORLD_TAG so the whole
+# layer can be shifted with a single canvas.move per frame.
+LAYERS = ('clouds', 'ground', 'pickups', 'obstacles', 'player', 'particles', 'hud')
+WORLD_TAG = 'world'
+FRAME_TAG = 'frame'  # immediate-mode items (the error overlay), deleted every frame
+
+# Particles live in fixed-capacity arrays; colours are indices into
+# PARTICLE_COLORS and fade through FADE_STEPS precomputed shades.
+PARTICLE_CAP = 512
+FADE_STEPS = 16
+PARTICLE_COLORS = (GROUND_DARK, GROUND_COLOR, COIN_COLOR, SHIELD_COLOR, SLOWMO_COLOR)
+
+# The day/night cycle is quantised to SKY_STEPS shades (see Palette)
+SKY_STEPS = 64
+
+# Clouds sit on their own layer, scrolling at this fraction of the world
+CLOUD_PARALLAX = 0.15
+
+# Night sky: persistent stars, one of which dims every STAR_TWINKLE_FRAMES
+STAR_COUNT = 40
+STAR_TWINKLE_FRAMES = 4
+
+# The ground is one pre-rendered strip that repeats every GROUND_TILE pixels
+GROUND_TILE = 180
+
+# Obstacle shapes: cactus sizes and bird heights above the ground. Every
+# combination is a variant, numbered in OBSTACLE_VARIANTS order (telemetry).
+CACTUS_WIDTHS = (20, 26, 32)
+CACTUS_HEIGHTS = (32, 38, 44)
+BIRD_LIFTS = (60, 90, 120)
+OBSTACLE_VARIANTS = tuple([f'cactus {w}x{h}' for w in CACTUS_WIDTHS for h in CACTUS_HEIGHTS] +
+                          [f'bird +{lift}' for lift in BIRD_LIFTS])
+
 # Difficulty presets (base speed, spawn rates)
 DIFF_PRESETS = {
     1: dict(base_speed=6.0, obs_min=900, obs_max=1400, coin_min=900, coin_max=1400),
@@ -118,30 +211,175 @@ DIFF_PRESETS = {
     3: dict(base_speed=9.0, obs_min=600, obs_max=1000, coin_min=700, coin_max=1200),
 }
 
-# High-score file
+# Speed ramp (update_speed): +1 per SPEED_RAMP_DIST of distance, at most
+# SPEED_RAMP_CAP over the base speed, always within MIN_SPEED..MAX_SPEED
+SPEED_RAMP_DIST = 1800.0
+SPEED_RAMP_CAP = 6.0
+MIN_SPEED, MAX_SPEED = 4.0, 16.0
+
+# Telemetry (see Telemetry): one record per event (tick, kind, arg, run,
+# a, b), ring capacity in records, writer period, and file rotation
+TM_RECORD = struct.Struct('<IBBHff')
+TM_FIELDS = ('tick', 'kind', 'arg', 'run', 'a', 'b')
+TM_MAGIC = b'DTEL'
+TM_CAPACITY = 4096
+TM_FLUSH_S = 0.5
+TM_FILE_BYTES = 4 << 20
+TM_FILES = 5
+# kinds, and what arg, a and b hold for each
+TM_KINDS = ('none', 'run', 'spawn', 'coin', 'powerup', 'shield_break', 'death', 'difficulty', 'hitch',
+            'coin_spawn')
+(TM_RUN,            # difficulty, -, -
+ TM_SPAWN,          # obstacle variant, scroll speed, y of the hitbox
+ TM_COIN,           # -, scroll speed at its spawn, ticks since its spawn
+ TM_POWERUP,        # 0 shield / 1 slowmo, x, y
+ TM_SHIELD_BREAK,   # -, player y, score
+ TM_DEATH,          # obstacle variant, scroll speed, score
+ TM_DIFFICULTY,     # new level, -, -
+ TM_HITCH,          # -, frame ms, budget ms
+ TM_COIN_SPAWN) = range(1, len(TM_KINDS))  # -, scroll speed, y
+
+# Scores and run history (see open_store): file name without extension,
+# records committed per writer transaction at most, leaderboard length, and
+# runs kept by the JSON fallback. HS_FILE is the old single high score,
+# imported once.
+SCORES_BASE = os.path.join(os.path.dirname(__file__), 'dino_scores')
+STORE_BATCH = 64
+STORE_TOP = 10
+STORE_JSON_RUNS = 5000
 HS_FILE = os.path.join(os.path.dirname(__file__), 'dino_highscore.json')
 
+# Input log (see InputLog): event codes, one byte each; EV_DIFFICULTY is
+# or-ed with the level
+REPLAY_MAGIC = b'DINO'
+REPLAY_VERSION = 1
+SEED_RANGE = 1 << 32  # seeds are 0..SEED_RANGE - 1, a uint32 in the replay header
+EV_END, EV_JUMP, EV_DUCK, EV_STAND, EV_PAUSE, EV_RESTART = range(6)
+EV_DIFFICULTY = 0x10
+
+# Frame profiler (F1 HUD): rolling window in frames, hitch log length, export path
+PROFILE_WINDOW = 240
+HITCH_LOG = 32
+PROFILE_HUD_FRAMES = 15  # frames between refreshes of the HUD's profile text
+PROFILE_FILE = os.path.join(os.path.dirname(__file__), 'dino_profile.json')
+
+# Allocation profiler (F2 or DINO_ALLOC=1): frames between per-line
+# snapshots, leak-check window, windows of growth that flag a line,
+# minimum growth, lines reported, report path
+ALLOC_SAMPLE_FRAMES = 30
+ALLOC_WINDOW_S = 5.0
+ALLOC_LEAK_WINDOWS = 4
+ALLOC_LEAK_BYTES = 4096
+ALLOC_TOP = 25
+ALLOC_FILE = os.path.join(os.path.dirname(__file__), 'dino_alloc.json')
+
+# Call profiler (F4): ticks captured, output path without extension
+# (-> .pstats and .folded collapsed stacks)
+CPROFILE_TICKS = 300
+CPROFILE_BASE = os.path.join(os.path.dirname(__file__), 'dino_calls')
+
+# Audio: sample rate of the synthesised tones, their volume (0..1) and the
+# number of frames' worth of sound requests the worker may fall behind by
+AUDIO_RATE = 22050
+AUDIO_VOLUME = 0.3
+AUDIO_QUEUE = 8
+
+# Autopilot (A key): ticks it looks ahead, pixels of clearance it keeps
+# in front of and behind obstacles, and ticks it waits on the game-over screen
+AUTOPILOT_HORIZON = 48
+AUTOPILOT_MARGIN = 3
+AUTOPILOT_RESTART_TICKS = 90
+
+# ------------------------------ Palette ------------------------------------- #
+
+class Palette:
+    """Colour tables computed once at import.
+
+    Everything the game blends, fades or inverts per frame is quantised and
+    looked up here by integer index, so the hot path never parses or
+    formats a hex string:
+
+    - `sky[i]`: day (0) to night (SKY_STEPS - 1) gradient, with
+      `sky_inv[i]` for high-contrast mode, `panel[i]` for overlay panels
+      and `night[i]` telling whether stars are out
+    - `fade[c * FADE_STEPS + k]`: PARTICLE_COLORS[c] at shade k, from the
+      day sky (k = 0) to full colour (k = FADE_STEPS - 1)
+    """
+
+    def __init__(self):
+        self.sky = [blend_hex(DAY_SKY, NIGHT_SKY, i / (SKY_STEPS - 1)) for i in range(SKY_STEPS)]
+        self.sky_inv = [invert_hex(col) for col in self.sky]
+        self.panel = [blend_hex(col, '#000000', 0.35) for col in self.sky]
+        self.night = [hex_mix_ratio(col, NIGHT_SKY) > 0.6 for col in self.sky]
+        self.fade = [blend_hex(DAY_SKY, col, k / (FADE_STEPS - 1))
+                     for col in PARTICLE_COLORS for k in range(FADE_STEPS)]
+
+    @staticmethod
+    def sky_index(phase: float) -> int:
+        """Quantise a day/night phase in [0, 1] to a `sky` index."""
+        return int(phase * (SKY_STEPS - 1) + 0.5)
+
+
+PALETTE = Palette()
+
 # ------------------------------ Data Classes -------------------------------- #
 
-@dataclass
+class GameClock:
+    """Game time in milliseconds.
+
+    Real time is sampled once per frame (`sample`, using monotonic_ns) and,
+    multiplied by `scale`, feeds the fixed-timestep loop. Game time itself
+    only moves when the simulation ticks (`advance`), so every Timer stands
+    still while the game is paused or over, and all timers read the same
+    value within a tick.
+    """
+
+    __slots__ = ('now', 'ticks', 'scale', 'real_ns')
+
+    def __init__(self, scale: float = 1.0):
+        self.now = 0.0
+        self.ticks = 0
+        self.scale = scale
+        self.real_ns = time.monotonic_ns()
+
+    def sample(self) -> float:
+        """Scaled real seconds elapsed since the previous sample."""
+        ns = time.monotonic_ns()
+        dt = (ns - self.real_ns) * 1e-9 * self.scale
+        self.real_ns = ns
+        return dt
+
+    def advance(self):
+        self.ticks += 1
+        self.now = self.ticks * STEP_MS
+
+
 class Timer:
-    duration: int
-    start_ms: int = field(default_factory=now_ms)
+    __slots__ = ('duration', 'clock', 'start_ms')
+
+    def __init__(self, duration: int, clock: GameClock):
+        self.duration = duration
+        self.clock = clock
+        self.start_ms = clock.now
+
+    def __repr__(self) -> str:
+        return f'Timer(duration={self.duration}, start_ms={self.start_ms})'
 
     def reset(self, duration: Optional[int] = None):
         if duration is not None:
             self.duration = duration
-        self.start_ms = now_ms()
+        self.start_ms = self.clock.now
 
     def done(self) -> bool:
-        return now_ms() - self.start_ms >= self.duration
+        return self.clock.now - self.start_ms >= self.duration
 
     def progress(self) -> float:
-        return clamp((now_ms() - self.start_ms) / max(1, self.duration), 0.0, 1.0)
+        return clamp((self.clock.now - self.start_ms) / max(1, self.duration), 0.0, 1.0)
 
 
 @dataclass
 class Rect:
+    __slots__ = ('x', 'y', 'w', 'h')
     x: float
     y: float
     w: float
@@ -151,221 +389,234 @@ class Rect:
         return (self.x, self.y, self.x + self.w, self.y + self.h)
 
     def intersects(self, other: 'Rect') -> bool:
-        ax1, ay1, ax2, ay2 = self.bbox()
-        bx1, by1, bx2, by2 = other.bbox()
-        return (ax1 < bx2 and ax2 > bx1 and ay1 < by2 and ay2 > by1)
+        # plain attribute compares: no bbox tuples on the collision hot path
+        return (self.x < other.x + other.w and self.x + self.w > other.x and
+                self.y < other.y + other.h and self.y + self.h > other.y)
 
     def inset(self, dx: float, dy: float) -> 'Rect':
         return Rect(self.x + dx, self.y + dy, max(0, self.w - 2*dx), max(0, self.h - 2*dy))
 
+    def copy(self) -> 'Rect':
+        return Rect(self.x, self.y, self.w, self.h)
+
 # ------------------------------ Entities ------------------------------------ #
 
 class Entity:
+    """Base entity. Rendering is retained-mode: `create` builds the canvas
+    items once, `refresh` only touches them when something visible changed,
+    and `destroy` deletes them when the entity leaves the game.
+
+    The simulation never calls these itself; a `TkView` does, so entities
+    that were never drawn (headless runs) own no items at all."""
+
+    __slots__ = ('g', 'dead', 'items', 'x', 'y', 'px', 'py', 'sx', 'sy')
+
     def __init__(self, game: 'Game'):
         self.g = game
         self.dead = False
+        self.items: List[int] = []
+        self.sx = self.sy = 0.0  # screen position of the current frame
 
     def update(self, dt: float):
         pass
 
-    def draw(self):
-        pass
-
-
-class Particle(Entity):
-    def __init__(self, game: 'Game', x: float, y: float, vx: float, vy: float, life: int, size: int, color: str, gravity: float = 0.0):
-        super().__init__(game)
-        self.x, self.y = x, y
-        self.vx, self.vy = vx, vy
-        self.life = Timer(life)
-        self.size = size
-        self.color = color
-        self.gravity = gravity
-        self.alpha = 1.0
+    def draw(self, view: 'TkView'):
+        # render at the position interpolated between the last two ticks
+        a = view.alpha
+        self.sx = self.px + (self.x - self.px) * a
+        self.sy = self.py + (self.y - self.py) * a
+        c = view.c
+        if not self.items:
+            self.create(c)
+            view.restack = True
+        else:
+            self.refresh(c)
 
-    def update(self, dt: float):
-        self.vy += self.gravity
-        self.x += self.vx
-        self.y += self.vy
-        t = self.life.progress()
-        self.alpha = 1.0 - t
-        if self.life.done():
-            self.dead = True
+    def create(self, c: tk.Canvas):
+        pass
 
-    def draw(self):
-        s = self.size * (0.5 + 0.5 * self.alpha)
-        x1, y1, x2, y2 = self.x - s, self.y - s, self.x + s, self.y + s
-        fill = self._fade(self.color, self.alpha)
-        self.g.c.create_oval(x1, y1, x2, y2, fill=fill, outline='')
+    def refresh(self, c: tk.Canvas):
+        pass
 
-    @staticmethod
-    def _fade(hex_color: str, alpha: float) -> str:
-        # blend with sky to fade
-        r, g, b = hex_to_rgb(hex_color)
-        sr, sg, sb = hex_to_rgb(DAY_SKY)
-        r = int(lerp(sr, r, alpha))
-        g = int(lerp(sg, g, alpha))
-        b = int(lerp(sb, b, alpha))
-        return rgb_to_hex(r, g, b)
+    def destroy(self, c: tk.Canvas):
+        if self.items:
+            c.delete(*self.items)
+            self.items.clear()
 
 
 class Cloud(Entity):
+    __slots__ = ('scale', 'speed_ref')
+
     def __init__(self, game: 'Game'):
         super().__init__(game)
-        self.y = random.randint(20, 120)
-        self.x = W + random.randint(0, 200)
-        self.speed = random.uniform(0.8, 1.5)
-        self.scale = random.uniform(0.7, 1.4)
+        rng = game.rng
+        self.y = rng.randint(20, 120)
+        self.x = W + rng.randint(0, 200)
+        self.scale = round(rng.uniform(0.7, 1.4), 1)  # one sprite per tenth
+        self.speed_ref = game.scroll_speed
+        self.px, self.py = self.x, self.y
 
     def update(self, dt: float):
-        self.x -= self.speed
+        # every cloud drifts at the same fraction of the world scroll, so the
+        # whole 'clouds' layer moves together (see TkView.draw)
+        self.x -= self.speed_ref() * CLOUD_PARALLAX
         if self.x < -120:
             self.dead = True
 
-    def draw(self):
-        s = 20 * self.scale
-        c = CLOUD_COLOR
-        self.g.c.create_oval(self.x, self.y, self.x + 3*s, self.y + 2*s, fill=c, outline='')
-        self.g.c.create_oval(self.x + 2*s, self.y - 0.5*s, self.x + 4*s, self.y + 1.5*s, fill=c, outline='')
-        self.g.c.create_oval(self.x - s, self.y + 0.3*s, self.x + s, self.y + 2.2*s, fill=c, outline='')
-
+    def create(self, c: tk.Canvas):
+        sp = SPRITES.cloud(self.scale)
+        self.items.append(c.create_image(self.sx + sp.ox, self.sy + sp.oy, image=sp.image, anchor='nw',
+                                         tags=('clouds',)))
 
-class GroundSeg(Entity):
-    def __init__(self, game: 'Game', x: float, width: float, speed_ref: Callable[[], float]):
-        super().__init__(game)
-        self.x = x
-        self.y = GROUND_Y
-        self.w = width
-        self.h = 6
-        self.speed_ref = speed_ref
 
-    def update(self, dt: float):
-        self.x -= self.speed_ref()
-        if self.x + self.w < 0:
-            self.dead = True
-
-    def draw(self):
-        y = self.y
-        self.g.c.create_rectangle(self.x, y, self.x + self.w, y + self.h, fill=GROUND_COLOR, outline='')
-        # little bumps
-        for i in range(5):
-            bx = self.x + (i + 0.5) * self.w / 5
-            bw = self.w / 8
-            self.g.c.create_rectangle(bx, y + 3, bx + bw, y + self.h, fill=GROUND_DARK, outline='')
+class Obstacle(Entity):
+    __slots__ = ('box', 'variant')
 
+    box: Rect  # hitbox, kept up to date in place by update()
+    variant: int  # index into OBSTACLE_VARIANTS
 
-class Obstacle(Entity):
     def rect(self) -> Rect:
-        raise NotImplementedError
+        return self.box.copy()
 
 
 class Cactus(Obstacle):
+    __slots__ = ('w', 'h', 'speed_ref', 'tilt')
+
     def __init__(self, game: 'Game', speed_ref: Callable[[], float]):
         super().__init__(game)
         self.x = W + 20
         self.y = GROUND_Y - 35
-        self.w = random.choice([20, 26, 32])
-        self.h = random.choice([32, 38, 44])
+        self.w = game.rng.choice(CACTUS_WIDTHS)
+        self.h = game.rng.choice(CACTUS_HEIGHTS)
+        self.variant = CACTUS_WIDTHS.index(self.w) * len(CACTUS_HEIGHTS) + CACTUS_HEIGHTS.index(self.h)
         self.speed_ref = speed_ref
-        self.tilt = random.choice([-1, 0, 1])
+        self.tilt = game.rng.choice([-1, 0, 1])
+        self.box = Rect(self.x, self.y + (44 - self.h), self.w, self.h)
+        self.px, self.py = self.x, self.y
 
     def update(self, dt: float):
         self.x -= self.speed_ref()
+        self.box.x = self.x
         if self.x + self.w < 0:
             self.dead = True
 
-    def draw(self):
-        x1, y1 = self.x, self.y + (44 - self.h)
-        x2, y2 = self.x + self.w, self.y + self.h
-        self.g.c.create_rectangle(x1, y1, x2, y2, fill=CACTUS_COLOR, outline='')
-        # arms
-        arm_h = self.h * 0.35
-        if self.w >= 26:
-            self.g.c.create_rectangle(x1 - 6, y1 + 10, x1 + 2, y1 + 10 + arm_h, fill=CACTUS_COLOR, outline='')
-        if self.w >= 32:
-            self.g.c.create_rectangle(x2 - 2, y1 + 6, x2 + 6, y1 + 6 + arm_h, fill=CACTUS_COLOR, outline='')
-
-    def rect(self) -> Rect:
-        return Rect(self.x, self.y + (44 - self.h), self.w, self.h)
+    def create(self, c: tk.Canvas):
+        # scrolls with the world layer, so it never needs refreshing
+        sp = SPRITES.cactus(self.w, self.h)
+        self.items.append(c.create_image(self.sx + sp.ox, self.sy + sp.oy, image=sp.image, anchor='nw',
+                                         tags=('obstacles', WORLD_TAG)))
 
 
 class Bird(Obstacle):
+    __slots__ = ('alt', 'w', 'h', 'flap_t', 'speed_ref', 'sprite')
+
     def __init__(self, game: 'Game', speed_ref: Callable[[], float]):
         super().__init__(game)
         self.x = W + 20
-        self.alt = random.choice([GROUND_Y - 60, GROUND_Y - 90, GROUND_Y - 120])
+        lift = game.rng.choice(BIRD_LIFTS)
+        self.alt = GROUND_Y - lift
         self.y = self.alt
+        self.variant = len(CACTUS_WIDTHS) * len(CACTUS_HEIGHTS) + BIRD_LIFTS.index(lift)
         self.w = 38
         self.h = 24
         self.flap_t = 0.0
         self.speed_ref = speed_ref
+        self.box = Rect(self.x + 4, self.y + 2, self.w - 8, self.h - 4)
+        self.px, self.py = self.x, self.y
 
     def update(self, dt: float):
         self.x -= self.speed_ref() * 1.15
+        self.box.x = self.x + 4
         self.flap_t += 0.2
         if self.x + self.w < 0:
             self.dead = True
 
-    def draw(self):
-        body = (self.x, self.y, self.x + self.w, self.y + self.h)
-        self.g.c.create_oval(*body, fill=BIRD_COLOR, outline='')
-        # wings
-        wing_phase = math.sin(self.flap_t)
-        spread = 10 + 8 * wing_phase
-        self.g.c.create_polygon(self.x + 10, self.y + 12,
-                                self.x - spread, self.y + 2,
-                                self.x - spread, self.y + 22,
-                                fill=BIRD_COLOR, outline='')
+    def create(self, c: tk.Canvas):
+        self.sprite = SPRITES.bird(self.flap_t)
+        sp = self.sprite
+        self.items.append(c.create_image(self.sx + sp.ox, self.sy + sp.oy, image=sp.image, anchor='nw',
+                                         tags=('obstacles',)))
 
-    def rect(self) -> Rect:
-        return Rect(self.x + 4, self.y + 2, self.w - 8, self.h - 4)
+    def refresh(self, c: tk.Canvas):
+        # flies faster than the ground scrolls, so it moves itself
+        sp = SPRITES.bird(self.flap_t)
+        c.coords(self.items[0], self.sx + sp.ox, self.sy + sp.oy)
+        if sp is not self.sprite:
+            self.sprite = sp
+            c.itemconfigure(self.items[0], image=sp.image)
 
 
 class Coin(Entity):
+    __slots__ = ('r', 'spin', 'speed_ref', 'taken', 'box', 'sprite', 'spawn_tick', 'spawn_speed')
+
     def __init__(self, game: 'Game', speed_ref: Callable[[], float]):
         super().__init__(game)
+        # telemetry bins a pickup with its spawn (see TM_COIN), not by the
+        # speed and time it was collected at
+        self.spawn_tick = game.clock.ticks
+        self.spawn_speed = game.tick_speed
         self.x = W + 20
-        self.y = random.choice([GROUND_Y - 40, GROUND_Y - 80, GROUND_Y - 120])
+        self.y = game.rng.choice([GROUND_Y - 40, GROUND_Y - 80, GROUND_Y - 120])
         self.r = 9
         self.spin = 0.0
         self.speed_ref = speed_ref
         self.taken = False
+        self.box = Rect(self.x - self.r, self.y - self.r, 2*self.r, 2*self.r)
+        self.px, self.py = self.x, self.y
 
     def update(self, dt: float):
         self.x -= self.speed_ref()
+        self.box.x = self.x - self.r
         self.spin += 0.25
         if self.x + self.r < 0:
             self.dead = True
-        if not self.taken and self.g.player.rect().intersects(self.rect()):
-            self.collect()
 
     def rect(self) -> Rect:
-        return Rect(self.x - self.r, self.y - self.r, 2*self.r, 2*self.r)
+        return self.box.copy()
 
     def collect(self):
+        if self.taken:
+            return
         self.taken = True
         self.dead = True
         self.g.score += 25
+        self.g.coins += 1
+        if self.g.telemetry:
+            self.g.telemetry.emit(TM_COIN, 0, self.spawn_speed, self.g.clock.ticks - self.spawn_tick)
         self.g.emit_spark(self.x, self.y)
         self.g.sfx_coin()
 
-    def draw(self):
-        # simulate spin by changing width
-        phase = (math.sin(self.spin) + 1) / 2  # 0..1
-        rx = lerp(self.r * 0.4, self.r, phase)
-        ry = self.r
-        self.g.c.create_oval(self.x - rx, self.y - ry, self.x + rx, self.y + ry, fill=COIN_COLOR, outline='#d4a52f', width=2)
-        self.g.c.create_oval(self.x - rx*0.5, self.y - ry*0.5, self.x + rx*0.5, self.y + ry*0.5, outline='#d4a52f')
+    def create(self, c: tk.Canvas):
+        # spin is simulated by sprite frames of varying width
+        self.sprite = SPRITES.coin(self.spin)
+        sp = self.sprite
+        self.items.append(c.create_image(self.sx + sp.ox, self.sy + sp.oy, image=sp.image, anchor='nw',
+                                         tags=('pickups',)))
+
+    def refresh(self, c: tk.Canvas):
+        sp = SPRITES.coin(self.spin)
+        c.coords(self.items[0], self.sx + sp.ox, self.sy + sp.oy)
+        if sp is not self.sprite:
+            self.sprite = sp
+            c.itemconfigure(self.items[0], image=sp.image)
 
 
 class PowerUp(Entity):
+    __slots__ = ('kind', 'r', 'speed_ref', 'box')
+
     kind: str
+    box: Rect  # hitbox, kept up to date in place by update()
 
     def rect(self) -> Rect:
+        return self.box.copy()
+
+    def collect(self):
         raise NotImplementedError
 
 
 class ShieldPU(PowerUp):
+    __slots__ = ('pulse',)
+
     def __init__(self, game: 'Game', speed_ref: Callable[[], float]):
         super().__init__(game)
         self.kind = 'shield'
@@ -374,29 +625,43 @@ class ShieldPU(PowerUp):
         self.r = 10
         self.speed_ref = speed_ref
         self.pulse = 0.0
+        self.box = Rect(self.x - self.r, self.y - self.r, 2*self.r, 2*self.r)
+        self.px, self.py = self.x, self.y
 
     def update(self, dt: float):
         self.x -= self.speed_ref()
+        self.box.x = self.x - self.r
         self.pulse += 0.2
         if self.x + self.r < 0:
             self.dead = True
-        if self.g.player.rect().intersects(self.rect()):
-            self.g.player.gain_shield()
-            self.g.emit_spark(self.x, self.y, color=SHIELD_COLOR)
-            self.g.sfx_power()
-            self.dead = True
 
-    def rect(self) -> Rect:
-        return Rect(self.x - self.r, self.y - self.r, 2*self.r, 2*self.r)
+    def collect(self):
+        if self.g.telemetry:
+            self.g.telemetry.emit(TM_POWERUP, 0, self.x, self.y)
+        self.g.player.gain_shield()
+        self.g.emit_spark(self.x, self.y, color=SHIELD_COLOR)
+        self.g.sfx_power()
+        self.dead = True
 
-    def draw(self):
+    def create(self, c: tk.Canvas):
+        box = self._ring()
+        self.items.append(c.create_oval(*box, outline=SHIELD_COLOR, width=2, tags=('pickups',)))
+        self.items.append(c.create_arc(*box, start=200, extent=140, style='arc', outline=SHIELD_COLOR, width=3, tags=('pickups',)))
+
+    def refresh(self, c: tk.Canvas):
+        box = self._ring()
+        c.coords(self.items[0], *box)
+        c.coords(self.items[1], *box)
+
+    def _ring(self) -> Tuple[float, float, float, float]:
         p = (math.sin(self.pulse) + 1) / 2
         rr = lerp(self.r, self.r * 1.5, p)
-        self.g.c.create_oval(self.x - rr, self.y - rr, self.x + rr, self.y + rr, outline=SHIELD_COLOR, width=2)
-        self.g.c.create_arc(self.x - rr, self.y - rr, self.x + rr, self.y + rr, start=200, extent=140, style=tk.ARC, outline=SHIELD_COLOR, width=3)
+        return (self.sx - rr, self.sy - rr, self.sx + rr, self.sy + rr)
 
 
 class SlowMoPU(PowerUp):
+    __slots__ = ('t',)
+
     def __init__(self, game: 'Game', speed_ref: Callable[[], float]):
         super().__init__(game)
         self.kind = 'slowmo'
@@ -405,32 +670,38 @@ class SlowMoPU(PowerUp):
         self.r = 10
         self.speed_ref = speed_ref
         self.t = 0.0
+        self.box = Rect(self.x - self.r, self.y - self.r, 2*self.r, 2*self.r)
+        self.px, self.py = self.x, self.y
 
     def update(self, dt: float):
         self.x -= self.speed_ref()
+        self.box.x = self.x - self.r
         self.t += 0.25
         if self.x + self.r < 0:
             self.dead = True
-        if self.g.player.rect().intersects(self.rect()):
-            self.g.activate_slowmo()
-            self.g.emit_spark(self.x, self.y, color=SLOWMO_COLOR)
-            self.g.sfx_power()
-            self.dead = True
 
-    def rect(self) -> Rect:
-        return Rect(self.x - self.r, self.y - self.r, 2*self.r, 2*self.r)
+    def collect(self):
+        if self.g.telemetry:
+            self.g.telemetry.emit(TM_POWERUP, 1, self.x, self.y)
+        self.g.activate_slowmo()
+        self.g.emit_spark(self.x, self.y, color=SLOWMO_COLOR)
+        self.g.sfx_power()
+        self.dead = True
 
-    def draw(self):
-        # hourglass symbol
+    def create(self, c: tk.Canvas):
+        # hourglass symbol; static, so it simply scrolls with the world layer
         r = self.r
-        x, y = self.x, self.y
-        self.g.c.create_polygon(x - r, y - r, x + r, y - r, x - r/2, y, fill='', outline=SLOWMO_COLOR)
-        self.g.c.create_polygon(x - r, y + r, x + r, y + r, x + r/2, y, fill='', outline=SLOWMO_COLOR)
-        self.g.c.create_line(x - r, y - r, x + r, y - r, fill=SLOWMO_COLOR)
-        self.g.c.create_line(x - r, y + r, x + r, y + r, fill=SLOWMO_COLOR)
+        x, y = self.sx, self.sy
+        tags = ('pickups', WORLD_TAG)
+        self.items.append(c.create_polygon(x - r, y - r, x + r, y - r, x - r/2, y, fill='', outline=SLOWMO_COLOR, tags=tags))
+        self.items.append(c.create_polygon(x - r, y + r, x + r, y + r, x + r/2, y, fill='', outline=SLOWMO_COLOR, tags=tags))
+        self.items.append(c.create_line(x - r, y - r, x + r, y - r, fill=SLOWMO_COLOR, tags=tags))
+        self.items.append(c.create_line(x - r, y + r, x + r, y + r, fill=SLOWMO_COLOR, tags=tags))
 
 
 class Player(Entity):
+    __slots__ = ('vy', 'on_ground', 'ducking', 'anim_t', 'shield', 'inv_timer', 'look', 'box', 'hitbox')
+
     def __init__(self, game: 'Game'):
         super().__init__(game)
         self.x = PLAYER_X
@@ -441,10 +712,23 @@ class Player(Entity):
         self.anim_t = 0.0
         self.shield = False
         self.inv_timer: Optional[Timer] = None
+        self.look: Optional[tuple] = None
+        # body box and the slightly smaller obstacle hitbox, refreshed in
+        # place once per tick by update_box()
+        self.box = Rect(0, 0, 0, 0)
+        self.hitbox = Rect(0, 0, 0, 0)
+        self.update_box()
+        self.px, self.py = self.x, self.y
 
     def rect(self) -> Rect:
+        return self.box.copy()
+
+    def update_box(self):
         h = DUCK_HEIGHT if self.ducking and self.on_ground else RUN_HEIGHT
-        return Rect(self.x - 14, self.y, 28, h)
+        b = self.box
+        b.x, b.y, b.w, b.h = self.x - 14, self.y, 28, h
+        hb = self.hitbox
+        hb.x, hb.y, hb.w, hb.h = b.x + 2, b.y + 2, b.w - 4, h - 4
 
     def gain_shield(self):
         self.shield = True
@@ -453,8 +737,10 @@ class Player(Entity):
     def hit(self):
         if self.shield:
             self.shield = False
+            if self.g.telemetry:
+                self.g.telemetry.emit(TM_SHIELD_BREAK, 0, self.y, self.g.score)
             self.g.emit_spark(self.x + 10, self.y + 10)
-            self.inv_timer = Timer(600)
+            self.inv_timer = Timer(600, self.g.clock)
             self.g.sfx_shield_break()
             return False  # not dead
         return True  # dead
@@ -481,11 +767,13 @@ class Player(Entity):
         # end of invulnerability after shield hit
         if self.inv_timer and self.inv_timer.done():
             self.inv_timer = None
+        self.update_box()
 
     def jump(self):
         if self.on_ground:
             self.vy = JUMP_VELOCITY * (0.88 if self.ducking else 1.0)
             self.on_ground = False
+            self.update_box()
             self.g.emit_jump_dust(self.x, GROUND_Y)
             self.g.sfx_jump()
 
@@ -495,67 +783,1088 @@ class Player(Entity):
             self.y = GROUND_Y - DUCK_HEIGHT
         elif self.on_ground:
             self.y = GROUND_Y - RUN_HEIGHT
+        self.update_box()
 
-    def draw(self):
-        inv = self.inv_timer is not None and (now_ms() // 80) % 2 == 0
+    def create(self, c: tk.Canvas):
+        self.items.append(c.create_image(0, 0, anchor='nw', tags=('player',)))
+        self.look = None
+        self.refresh(c)
+
+    def refresh(self, c: tk.Canvas):
+        inv = self.inv_timer is not None and (self.g.clock.now // 80) % 2 == 0
         color = PLAYER_ACCENT if inv else PLAYER_COLOR
-        # body
-        r = self.rect()
-        self.g.c.create_rectangle(r.x, r.y, r.x + r.w, r.y + r.h, fill=color, outline='')
-        # legs animation (simple two-frame)
-        if self.on_ground and not self.ducking:
-            phase = int(self.anim_t) % 2
-            lx = r.x + 4
-            rx = r.x + r.w - 4
-            y = r.y + r.h
-            if phase == 0:
-                self.g.c.create_line(lx, y, lx - 6, y + 10, width=3)
-                self.g.c.create_line(rx, y, rx + 6, y + 10, width=3)
-            else:
-                self.g.c.create_line(lx, y, lx + 6, y + 10, width=3)
-                self.g.c.create_line(rx, y, rx - 6, y + 10, width=3)
-        # head
+        legs = self.on_ground and not self.ducking
+        phase = int(self.anim_t) % 2 if legs else -1  # simple two-frame legs
         head_r = 9 if not self.ducking else 7
-        self.g.c.create_oval(r.x + r.w - 10 - head_r, r.y - head_r,
-                             r.x + r.w - 10 + head_r, r.y + head_r, fill=color, outline='')
-        # eye
-        self.g.c.create_oval(r.x + r.w - 8, r.y - 3, r.x + r.w - 5, r.y, fill='#111', outline='')
-        # shield aura
-        if self.shield:
-            self.g.c.create_oval(r.x - 6, r.y - 8, r.x + r.w + 6, r.y + r.h + 6, outline=SHIELD_COLOR, width=2)
+        sp = SPRITES.player(self.box.h, phase, head_r, color, self.shield)
+        # only touch the canvas when the sprite or the position changed
+        look = (self.sx, self.sy, sp)
+        if look == self.look:
+            return
+        if self.look is None or self.look[2] is not sp:
+            c.itemconfigure(self.items[0], image=sp.image)
+        self.look = look
+        c.coords(self.items[0], self.sx + sp.ox, self.sy + sp.oy)
+
+
+# ------------------------------ Collisions ---------------------------------- #
+
+class SweepIndex:
+    """Broad phase for everything the player can touch (obstacles, coins,
+    power-ups).
+
+    Entities are kept sorted by the left edge of their `box`. Everything
+    scrolls left at nearly the same speed, so the order barely changes
+    between ticks and one insertion-sort pass restores it in ~O(n). A query
+    walks from the left and stops at the first box starting past the
+    range, so only the few entities overlapping the player's column reach
+    the narrow phase.
+    """
+
+    def __init__(self):
+        self.items: List[Entity] = []
+
+    def add(self, e: Entity):
+        self.items.append(e)
+
+    def clear(self):
+        self.items.clear()
+
+    def refresh(self):
+        # drop dead entries in place, then re-sort by left edge
+        items = self.items
+        k = 0
+        for e in items:
+            if not e.dead:
+                items[k] = e
+                k += 1
+        del items[k:]
+        for i in range(1, k):
+            e = items[i]
+            x = e.box.x
+            j = i - 1
+            while j >= 0 and items[j].box.x > x:
+                items[j + 1] = items[j]
+                j -= 1
+            items[j + 1] = e
+
+    def query(self, x1: float, x2: float, out: List[Entity]) -> List[Entity]:
+        """Fill `out` with the live entities whose box spans overlap [x1, x2)."""
+        out.clear()
+        for e in self.items:
+            b = e.box
+            if b.x >= x2:
+                break
+            if b.x + b.w > x1 and not e.dead:
+                out.append(e)
+        return out
+
+# ------------------------------ Particles ----------------------------------- #
+
+class ParticleSystem:
+    """Struct-of-arrays particle store.
+
+    Live particles are packed into slots [0, n) of contiguous arrays, so a
+    tick is a handful of vectorised operations (NumPy when available, a
+    plain loop over `array` storage otherwise) instead of one Python object
+    and one Timer per particle. Bursts are written in one go and anything
+    beyond `cap` live particles is dropped. Random spreads come from `rng`
+    (the owning game's, so runs replay exactly).
+    """
+
+    FIELDS = ('x', 'y', 'px', 'py', 'vx', 'vy', 'grav', 'age', 'life', 'size', 'color')
+
+    def __init__(self, rng: random.Random, cap: int = PARTICLE_CAP):
+        self.rng = rng
+        self.cap = cap
+        self.n = 0
+        for name in self.FIELDS:
+            if np is not None:
+                setattr(self, name, np.zeros(cap, dtype=np.float64))
+            else:
+                setattr(self, name, array('d', bytes(8 * cap)))
+
+    def __len__(self) -> int:
+        return self.n
+
+    def clear(self):
+        self.n = 0
+
+    def burst(self, x: float, y: float, count: int, ang: Tuple[float, float], speed: Tuple[float, float],
+              life: Tuple[int, int], size: Tuple[int, int], color: str, gravity: float = 0.0):
+        """Emit `count` particles from (x, y) with random angle/speed/life/size
+        drawn from the given (lo, hi) ranges."""
+        i = self.n
+        end = min(self.cap, i + count)
+        ci = PARTICLE_COLORS.index(color)
+        X, Y, PX, PY, VX, VY = self.x, self.y, self.px, self.py, self.vx, self.vy
+        rng = self.rng
+        for k in range(i, end):
+            a = rng.uniform(*ang)
+            sp = rng.uniform(*speed)
+            X[k] = PX[k] = x
+            Y[k] = PY[k] = y
+            VX[k] = math.cos(a) * sp
+            VY[k] = math.sin(a) * sp
+            self.grav[k] = gravity
+            self.age[k] = 0.0
+            self.life[k] = rng.randint(*life)
+            self.size[k] = rng.randint(*size)
+            self.color[k] = ci
+        self.n = end
+
+    def update(self):
+        n = self.n
+        if n == 0:
+            return
+        if np is not None:
+            self.px[:n] = self.x[:n]
+            self.py[:n] = self.y[:n]
+            self.vy[:n] += self.grav[:n]
+            self.x[:n] += self.vx[:n]
+            self.y[:n] += self.vy[:n]
+            self.age[:n] += STEP_MS
+            alive = self.age[:n] < self.life[:n]
+            k = int(alive.sum())
+            if k < n:
+                for name in self.FIELDS:
+                    arr = getattr(self, name)
+                    arr[:k] = arr[:n][alive]
+                self.n = k
+        else:
+            X, Y, PX, PY, VX, VY, G, AGE, LIFE = (self.x, self.y, self.px, self.py,
+                                                   self.vx, self.vy, self.grav, self.age, self.life)
+            k = 0
+            for i in range(n):
+                vy = VY[i] + G[i]
+                age = AGE[i] + STEP_MS
+                if age >= LIFE[i]:
+                    continue
+                if k != i:
+                    for name in self.FIELDS:
+                        arr = getattr(self, name)
+                        arr[k] = arr[i]
+                PX[k] = X[i]
+                PY[k] = Y[i]
+                VY[k] = vy
+                X[k] = X[i] + VX[i]
+                Y[k] = Y[i] + vy
+                AGE[k] = age
+                k += 1
+            self.n = k
+
+    def frame(self, a: float) -> Tuple[list, list, list, list]:
+        """Per-particle render data at interpolation factor `a`: centre x,
+        centre y, radius and fade-ramp index (color * FADE_STEPS + shade)."""
+        n = self.n
+        if np is not None:
+            x = self.px[:n] + (self.x[:n] - self.px[:n]) * a
+            y = self.py[:n] + (self.y[:n] - self.py[:n]) * a
+            alpha = 1.0 - np.minimum(self.age[:n] / self.life[:n], 1.0)
+            r = self.size[:n] * (0.5 + 0.5 * alpha)
+            shade = (alpha * (FADE_STEPS - 1) + 0.5).astype(np.int64)
+            ramp = self.color[:n].astype(np.int64) * FADE_STEPS + shade
+            return x.tolist(), y.tolist(), r.tolist(), ramp.tolist()
+        xs, ys, rs, ramps = [], [], [], []
+        for i in range(n):
+            px, py = self.px[i], self.py[i]
+            alpha = 1.0 - min(self.age[i] / self.life[i], 1.0)
+            xs.append(px + (self.x[i] - px) * a)
+            ys.append(py + (self.y[i] - py) * a)
+            rs.append(self.size[i] * (0.5 + 0.5 * alpha))
+            ramps.append(int(self.color[i]) * FADE_STEPS + int(alpha * (FADE_STEPS - 1) + 0.5))
+        return xs, ys, rs, ramps
+
+# ------------------------------ Profiling ----------------------------------- #
+
+class FrameProfiler:
+    """Rolling per-phase frame timings for the F1 debug HUD.
+
+    The loop calls `start` when a frame begins and `mark(phase)` after each
+    phase, which charges the time since the previous mark to that phase;
+    `end_frame` closes the frame. Nothing is timed unless a profiler is
+    attached (Game.prof / TkView.prof are None otherwise).
+    """
+
+    def __init__(self, budget_ms: float = STEP_MS):
+        self.budget_ms = budget_ms
+        self.frames = 0
+        self.t = time.perf_counter_ns()
+        self.frame: Dict[str, int] = {}  # ns charged to each phase this frame
+        self.samples: Dict[str, deque] = {}  # phase -> last PROFILE_WINDOW times in ms
+        self.created: deque = deque(maxlen=PROFILE_WINDOW)  # canvas items created per frame
+        self.live = 0
+        self.last_id = 0
+        self.hitches: deque = deque(maxlen=HITCH_LOG)
+
+    def start(self):
+        self.t = time.perf_counter_ns()
+
+    def mark(self, phase: str):
+        t = time.perf_counter_ns()
+        self.frame[phase] = self.frame.get(phase, 0) + t - self.t
+        self.t = t
+
+    def end_frame(self, canvas: Optional[tk.Canvas] = None):
+        self.frames += 1
+        total = 0
+        for phase, ns in self.frame.items():
+            self.sample(phase, ns / 1e6)
+            total += ns
+        total_ms = total / 1e6
+        self.sample('frame', total_ms)
+        if canvas is not None:
+            # canvas ids only ever grow, so ids above the last maximum are new
+            ids = canvas.find_all()
+            self.live = len(ids)
+            top = max(ids, default=self.last_id)
+            self.created.append(sum(1 for i in ids if i > self.last_id))
+            self.last_id = max(top, self.last_id)
+        if total_ms > self.budget_ms:
+            self.hitches.append({
+                'frame': self.frames,
+                'ms': round(total_ms, 3),
+                'phases': {k: round(v / 1e6, 3) for k, v in self.frame.items()},
+            })
+        self.frame = {}
+
+    def sample(self, phase: str, ms: float):
+        q = self.samples.get(phase)
+        if q is None:
+            q = self.samples[phase] = deque(maxlen=PROFILE_WINDOW)
+        q.append(ms)
+
+    def percentiles(self, phase: str) -> Tuple[float, float, float]:
+        """p50/p95/p99 of the phase's rolling window, in ms."""
+        xs = sorted(self.samples.get(phase, ()))
+        if not xs:
+            return (0.0, 0.0, 0.0)
+        n = len(xs) - 1
+        return tuple(xs[round(n * q)] for q in (0.50, 0.95, 0.99))
+
+    def slowest(self, k: int) -> List[str]:
+        """The k phases with the highest p95, slowest first."""
+        phases = [p for p in self.samples if p != 'frame']
+        return sorted(phases, key=lambda p: self.percentiles(p)[1], reverse=True)[:k]
+
+    def summary(self) -> dict:
+        created = list(self.created)
+        return {
+            'frames': self.frames,
+            'budget_ms': self.budget_ms,
+            'window': PROFILE_WINDOW,
+            'phases': {p: dict(zip(('p50', 'p95', 'p99'), self.percentiles(p))) for p in self.samples},
+            'items_created_per_frame': sum(created) / len(created) if created else 0.0,
+            'items_live': self.live,
+            'hitches': list(self.hitches),
+        }
+
+    def export(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+class AllocProfiler:
+    """Allocations by source line while the game runs (F2, or DINO_ALLOC=1).
+
+    Runs tracemalloc while it exists. Every frame `end_frame` records the
+    frame's transient peak: bytes allocated on top of what was live when
+    the frame began, freed or not. Every ALLOC_SAMPLE_FRAMES frames it
+    takes a snapshot, groups it by source line and charges each line that
+    grew since the last sample with that growth, so lines are ranked by
+    what they hold on to; a snapshot costs several ms, too much to take
+    every frame. Every ALLOC_WINDOW_S the per-line sizes are kept, and a
+    line that grew in each of the last ALLOC_LEAK_WINDOWS windows, by
+    ALLOC_LEAK_BYTES or more in all, is reported as a likely leak.
+    Nothing runs while it is detached (TkView.alloc is None).
+    """
+
+    SKIP = {tracemalloc.__file__, '<unknown>', '<frozen importlib._bootstrap>'}
+
+    def __init__(self):
+        self.own = not tracemalloc.is_tracing()  # stop tracemalloc again in stop()
+        if self.own:
+            tracemalloc.start()
+        # what this class itself keeps (the samples) is not the game's
+        src, first = inspect.getsourcelines(AllocProfiler)
+        self.mine = range(first, first + len(src))
+        self.frames = 0
+        self.t0 = self.window_t = time.perf_counter()
+        self.lines: Dict[Tuple[str, int], List[int]] = {}  # line -> [bytes, blocks] of growth charged
+        self.transient: deque = deque(maxlen=PROFILE_WINDOW)  # bytes per frame
+        self.transient_max = 0
+        self.windows: deque = deque(maxlen=ALLOC_LEAK_WINDOWS + 1)  # (live bytes, {line: bytes})
+        self.prev = self.sample()
+        tracemalloc.reset_peak()
+        self.start_mem = tracemalloc.get_traced_memory()[0]
+
+    def sample(self) -> Dict[Tuple[str, int], Tuple[int, int]]:
+        out = {}
+        for stat in tracemalloc.take_snapshot().statistics('lineno'):
+            fr = stat.traceback[0]
+            if fr.filename not in self.SKIP and not (fr.filename == __file__ and fr.lineno in self.mine):
+                out[fr.filename, fr.lineno] = (stat.size, stat.count)
+        return out
+
+    def end_frame(self):
+        _, peak = tracemalloc.get_traced_memory()
+        self.frames += 1
+        self.transient.append(peak - self.start_mem)
+        self.transient_max = max(self.transient_max, peak - self.start_mem)
+
+        if self.frames % ALLOC_SAMPLE_FRAMES == 0:
+            cur = self.sample()
+            prev = self.prev
+            for line, (size, count) in cur.items():
+                size0, count0 = prev.get(line, (0, 0))
+                if size > size0:
+                    acc = self.lines.setdefault(line, [0, 0])
+                    acc[0] += size - size0
+                    acc[1] += max(0, count - count0)
+            self.prev = cur
+            t = time.perf_counter()
+            if t - self.window_t >= ALLOC_WINDOW_S:
+                self.window_t = t
+                self.windows.append((sum(s for s, _ in cur.values()), cur))
+
+        # the next frame's peak starts from here, after our own work
+        tracemalloc.reset_peak()
+        self.start_mem = tracemalloc.get_traced_memory()[0]
+
+    def leaks(self) -> List[dict]:
+        if len(self.windows) <= ALLOC_LEAK_WINDOWS:
+            return []
+        samples = [lines for _, lines in self.windows]
+        found = []
+        for line in samples[-1]:
+            seq = [s.get(line, (0, 0))[0] for s in samples]
+            if all(b > a for a, b in zip(seq, seq[1:])) and seq[-1] - seq[0] >= ALLOC_LEAK_BYTES:
+                found.append({'line': self.where(line), 'live_bytes': seq, 'source': self.source(line)})
+        found.sort(key=lambda d: d['live_bytes'][0] - d['live_bytes'][-1])
+        return found
+
+    @staticmethod
+    def where(line: Tuple[str, int]) -> str:
+        return f'{os.path.basename(line[0])}:{line[1]}'
+
+    @staticmethod
+    def source(line: Tuple[str, int]) -> str:
+        return linecache.getline(*line).strip()
+
+    def summary(self) -> dict:
+        frames = max(1, self.frames)
+        transient = sorted(self.transient)
+        top = sorted(self.lines.items(), key=lambda kv: kv[1][0], reverse=True)[:ALLOC_TOP]
+        return {
+            'frames': self.frames,
+            'seconds': round(time.perf_counter() - self.t0, 1),
+            'transient_bytes_per_frame': {
+                'p50': transient[len(transient) // 2] if transient else 0,
+                'p95': transient[int(len(transient) * 0.95)] if transient else 0,
+                'max': self.transient_max,
+            },
+            'sample_frames': ALLOC_SAMPLE_FRAMES,
+            'lines': [{'line': self.where(line), 'bytes_per_frame': round(b / frames, 1),
+                       'blocks_per_frame': round(n / frames, 2), 'source': self.source(line)}
+                      for line, (b, n) in top],
+            'window_s': ALLOC_WINDOW_S,
+            'live_bytes_per_window': [total for total, _ in self.windows],
+            'leaks': self.leaks(),
+        }
+
+    def export(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=1)
+
+    def stop(self):
+        self.prev = {}
+        self.windows.clear()
+        if self.own:
+            tracemalloc.stop()
+
+
+class CallProfiler:
+    """cProfile over the next `ticks` game ticks (F4 or TkView.capture_calls).
+
+    Only the update and draw phases of each frame run under the profiler,
+    so the time Tk sits idle between frames is not in the profile. Each
+    phase is entered through its own method (TkView.run_ticks and
+    TkView.draw), which is the root of that phase's calls in the .pstats
+    file and is labelled `update` or `draw` in the collapsed stacks.
+    Only ticks that advance the game count, not frames spent paused or on
+    the game-over screen. The capture ends at the first frame boundary
+    after `ticks` ticks and the files are written on a thread, so the game
+    keeps running.
+
+    cProfile keeps caller/callee pairs rather than whole stacks, so in the
+    collapsed stacks a function's time is split over its callers in
+    proportion to the time each of them spent in it.
+    """
+
+    def __init__(self, ticks: int = CPROFILE_TICKS, base: str = CPROFILE_BASE):
+        self.pr = cProfile.Profile()
+        self.want = ticks
+        self.ticks = 0
+        self.frames = 0
+        self.base = base
+        self.roots: Dict[tuple, str] = {}  # pstats key of a phase's method -> label
+        self.writer: Optional[threading.Thread] = None
+
+    def run(self, label: str, fn: Callable):
+        code = fn.__code__
+        self.roots[code.co_filename, code.co_firstlineno, code.co_name] = label
+        self.pr.enable()
+        try:
+            return fn()
+        finally:
+            self.pr.disable()
+
+    def end_frame(self, ticks: int) -> bool:
+        """Count a frame that advanced the game `ticks` ticks; True once the
+        capture is done."""
+        self.frames += 1
+        self.ticks += ticks
+        return self.ticks >= self.want
+
+    def finish(self):
+        stats = pstats.Stats(self.pr)  # collected here, written off the frame loop
+        self.writer = threading.Thread(target=self.write, args=(stats,), name='dino-cprofile')
+        self.writer.start()
+
+    def write(self, stats: pstats.Stats):
+        stats.dump_stats(self.base + '.pstats')
+        with open(self.base + '.folded', 'w', encoding='utf-8') as f:
+            for stack, us in sorted(self.folded(stats).items()):
+                f.write(f'{stack} {us}\n')
+
+    def folded(self, stats: pstats.Stats) -> Dict[str, int]:
+        """Collapsed stacks ('update;a;b 123', microseconds of self time)."""
+        entries = stats.stats  # func -> (calls, ncalls, tottime, cumtime, callers)
+        children: Dict[tuple, list] = {}
+        for callee, (*_, callers) in entries.items():
+            for caller, edge in callers.items():
+                children.setdefault(caller, []).append((callee, edge[3]))
+        out: Dict[str, float] = {}
+
+        def walk(func, path, seen, share):
+            _, _, tt, ct, _ = entries[func]
+            scale = share / ct if ct else 0.0
+            path = f'{path};{self.frame_name(func)}'
+            if tt * scale:
+                out[path] = out.get(path, 0.0) + tt * scale
+            for child, edge_ct in children.get(func, ()):
+                if child not in seen and edge_ct * scale > 1e-7:
+                    walk(child, path, seen | {child}, edge_ct * scale)
+
+        for root, label in self.roots.items():
+            if root in entries:
+                walk(root, label, {root}, entries[root][3])
+        return {stack: round(s * 1e6) for stack, s in out.items() if s >= 5e-7}
+
+    @staticmethod
+    def frame_name(func: tuple) -> str:
+        filename, lineno, name = func
+        if filename == '~':
+            return name  # builtins
+        return f'{name} ({os.path.basename(filename)}:{lineno})'
+
+
+# ------------------------------ Telemetry ----------------------------------- #
+
+class Telemetry:
+    """Gameplay events as fixed-size records (TM_RECORD), for offline analysis.
+
+    `emit` packs a record straight into a preallocated ring on the game
+    thread and bumps the write count. It neither locks nor allocates with
+    `drop_oldest`, or while the ring has room; a lossless emit into a full
+    ring spills it first (below), which takes the lock and copies the ring.
+    A writer thread wakes every TM_FLUSH_S, takes a snapshot of the ring
+    (one bytes() copy, atomic under the GIL) and appends the new records
+    to `path`, rotated through TM_FILES files of about TM_FILE_BYTES each.
+    A path ending in .jsonl gets one JSON object per line; anything else
+    gets TM_MAGIC followed by the raw records (see read_telemetry).
+
+    When the writer falls a full ring behind, a lossless telemetry spills
+    the ring to a side list (memory grows until it catches up); with
+    `drop_oldest` the ring is simply overwritten, memory stays bounded, and
+    the records lost are counted in `dropped`.
+    """
+
+    def __init__(self, path: str, capacity: int = TM_CAPACITY, drop_oldest: bool = False):
+        self.clock: Optional[GameClock] = None  # set by Game.attach_telemetry
+        self.path = path
+        self.jsonl = path.endswith('.jsonl')
+        self.capacity = capacity
+        self.drop_oldest = drop_oldest
+        self.ring = bytearray(capacity * TM_RECORD.size)
+        self.head = 0   # records ever emitted; written only by the game thread
+        self.read = 0   # records taken by the writer
+        self.run = 0    # run counter stamped on every record
+        self.dropped = 0
+        self.written = 0
+        self.spilled: List[bytes] = []
+        self.lock = threading.Lock()  # only taken by the writer and by spill()
+        self.file = None
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.loop, name='telemetry', daemon=True)
+        self.thread.start()
+
+    def emit(self, kind: int, arg: int = 0, a: float = 0.0, b: float = 0.0):
+        head = self.head
+        if head - self.read >= self.capacity and not self.drop_oldest:
+            self.spill()
+        TM_RECORD.pack_into(self.ring, (head % self.capacity) * TM_RECORD.size,
+                            self.clock.ticks, kind, arg, self.run & 0xFFFF, a, b)
+        self.head = head + 1
+
+    def spill(self):
+        # the writer is a full ring behind: move the ring aside rather than lose it
+        with self.lock:
+            self.spilled.append(self.span(bytes(self.ring), self.read, self.head))
+            self.read = self.head
+
+    def span(self, ring: bytes, start: int, end: int) -> bytes:
+        # records [start, end) of a ring snapshot, oldest first
+        if end <= start:
+            return b''
+        size, cap = TM_RECORD.size, self.capacity
+        i, j = (start % cap) * size, (end % cap) * size
+        return ring[i:j] if i < j else ring[i:] + ring[:j]
+
+    def take(self) -> bytes:
+        """Everything emitted since the last take, oldest first."""
+        with self.lock:
+            end = self.head
+            ring = bytes(self.ring)
+            start = self.read
+            if self.drop_oldest:
+                # emits since `end` overwrote the oldest slots, and emit packs
+                # its record before bumping head, so the slot of record `head`
+                # may already hold the next one: only what follows is intact
+                head = self.head
+                start = min(end, max(start, head + 1 - self.capacity))
+                self.dropped += start - self.read
+            data = b''.join(self.spilled) + self.span(ring, start, end)
+            self.spilled.clear()
+            self.read = end
+        return data
+
+    def loop(self):
+        while not self.stop.wait(TM_FLUSH_S):
+            self.flush()
+        self.flush()
+        if self.file:
+            self.file.close()
+
+    def flush(self):
+        data = self.take()
+        if not data:
+            return
+        try:
+            if self.file is None:
+                self.open()
+            if self.jsonl:
+                for rec in TM_RECORD.iter_unpack(data):
+                    ev = dict(zip(TM_FIELDS, rec))
+                    ev['kind'] = TM_KINDS[ev['kind']]
+                    self.file.write(json.dumps(ev, separators=(',', ':')) + '\n')
+            else:
+                self.file.write(data)
+            self.file.flush()
+            self.written += len(data) // TM_RECORD.size
+            if self.file.tell() >= TM_FILE_BYTES:
+                self.file.close()
+                self.file = None
+                self.rotate()
+        except OSError:
+            self.dropped += len(data) // TM_RECORD.size
+
+    def open(self):
+        if self.jsonl:
+            self.file = open(self.path, 'a', encoding='utf-8')
+        else:
+            self.file = open(self.path, 'ab')
+            if self.file.tell() == 0:
+                self.file.write(TM_MAGIC + struct.pack('<B', TM_RECORD.size))
+
+    def rotate(self):
+        # path -> path.1 -> path.2 ...; the oldest falls off the end
+        for n in range(TM_FILES - 1, 0, -1):
+            src = self.path if n == 1 else f'{self.path}.{n - 1}'
+            if os.path.exists(src):
+                os.replace(src, f'{self.path}.{n}')
+
+    def close(self):
+        """Write out everything emitted so far and stop the writer."""
+        self.stop.set()
+        self.thread.join(timeout=5)
+
+
+def read_telemetry(path: str):
+    """Yield the records of a binary telemetry file as dicts (TM_FIELDS)."""
+    with open(path, 'rb') as f:
+        head = f.read(len(TM_MAGIC) + 1)
+        if head[:len(TM_MAGIC)] != TM_MAGIC or head[-1] != TM_RECORD.size:
+            raise ValueError(f'{path}: not a telemetry file')
+        for rec in TM_RECORD.iter_unpack(f.read()):
+            yield dict(zip(TM_FIELDS, rec))
+
+
+# ------------------------------ Scores -------------------------------------- #
+
+@dataclass
+class RunRecord:
+    """One finished run. `seed` and `start_tick` locate it in its game's
+    input log, should one have been recorded."""
+    difficulty: int
+    score: int
+    distance: float
+    ticks: int
+    coins: int
+    cause: str  # what ended the run: 'cactus' or 'bird'
+    seed: int
+    start_tick: int
+    ended: float = 0.0  # wall-clock time.time(); filled in by add_run if 0
+
+
+class ScoreStore:
+    """High scores and run history, persisted off the Tk thread.
+
+    `add_run` updates the in-memory per-difficulty bests and queues the
+    record; a writer thread takes whatever has queued up, up to
+    STORE_BATCH records, and commits it in one go. Queries (`top`,
+    `recent`) see records once they are committed; `flush` waits for that.
+    Subclasses provide `load`, `write` and the queries; see open_store().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.bests: Dict[int, int] = {d: 0 for d in DIFF_PRESETS}
+        self.queue: queue.Queue = queue.Queue()
+        self.errors = 0
+        self.load()
+        self.thread = threading.Thread(target=self.run, name='scores', daemon=True)
+        self.thread.start()
+
+    def best(self, difficulty: int) -> int:
+        return self.bests.get(difficulty, 0)
+
+    def add_run(self, rec: RunRecord):
+        if not rec.ended:
+            rec.ended = time.time()
+        if rec.score > self.bests.get(rec.difficulty, 0):
+            self.bests[rec.difficulty] = rec.score
+        self.queue.put(rec)
+
+    def run(self):
+        q = self.queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < STORE_BATCH and not q.empty():
+                batch.append(q.get_nowait())
+            recs = [r for r in batch if r is not None]
+            if recs:
+                try:
+                    self.write(recs)
+                except Exception:
+                    self.errors += 1  # keep playing; this batch is lost
+            for _ in batch:
+                q.task_done()
+            if len(recs) < len(batch):
+                return  # close() was called
+
+    def flush(self):
+        """Block until every queued record has been written."""
+        self.queue.join()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout=5)
+
+    def load(self):
+        raise NotImplementedError
+
+    def write(self, recs: List[RunRecord]):
+        raise NotImplementedError
+
+    def top(self, difficulty: int, n: int = 10) -> List[RunRecord]:
+        raise NotImplementedError
+
+    def recent(self, n: int = 20) -> List[RunRecord]:
+        raise NotImplementedError
+
+
+RUN_FIELDS = ('difficulty', 'score', 'distance', 'ticks', 'coins', 'cause', 'seed', 'start_tick', 'ended')
+
+
+class SqliteStore(ScoreStore):
+    """SQLite in WAL mode. The writer thread owns one connection, queries
+    use another, so reading a leaderboard never waits for a commit."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            difficulty INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            distance REAL NOT NULL,
+            ticks INTEGER NOT NULL,
+            coins INTEGER NOT NULL,
+            cause TEXT NOT NULL,
+            seed INTEGER NOT NULL,
+            start_tick INTEGER NOT NULL,
+            ended REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS runs_top ON runs (difficulty, score DESC);
+        CREATE INDEX IF NOT EXISTS runs_recent ON runs (ended DESC);
+    """
+
+    def connect(self) -> 'sqlite3.Connection':
+        db = sqlite3.connect(self.path, timeout=5)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        return db
+
+    def load(self):
+        self.db = self.connect()
+        self.db.executescript(self.SCHEMA)
+        for d, best in self.db.execute('SELECT difficulty, MAX(score) FROM runs GROUP BY difficulty'):
+            self.bests[d] = best
+
+    def write(self, recs: List[RunRecord]):
+        if not hasattr(self, 'wdb'):
+            self.wdb = self.connect()  # sqlite connections stay on the thread that made them
+        with self.wdb:
+            self.wdb.executemany(f"INSERT INTO runs ({', '.join(RUN_FIELDS)}) VALUES ({', '.join('?' * len(RUN_FIELDS))})",
+                                 [tuple(getattr(r, k) for k in RUN_FIELDS) for r in recs])
+
+    def run(self):
+        super().run()
+        if hasattr(self, 'wdb'):
+            self.wdb.close()
+
+    def query(self, where: str, args: tuple) -> List[RunRecord]:
+        rows = self.db.execute(f"SELECT {', '.join(RUN_FIELDS)} FROM runs {where}", args)
+        return [RunRecord(*row) for row in rows]
+
+    def top(self, difficulty: int, n: int = 10) -> List[RunRecord]:
+        return self.query('WHERE difficulty = ? ORDER BY score DESC LIMIT ?', (difficulty, n))
+
+    def recent(self, n: int = 20) -> List[RunRecord]:
+        return self.query('ORDER BY ended DESC LIMIT ?', (n,))
+
+    def close(self):
+        super().close()
+        self.db.close()
+
+
+class JsonStore(ScoreStore):
+    """Fallback for Pythons built without sqlite3 (or an unusable database):
+    one JSON file, rewritten per batch to a temporary file and swapped in
+    with os.replace, so a crash leaves either the old or the new file.
+    Keeps the STORE_JSON_RUNS most recent runs plus every leaderboard."""
+
+    def load(self):
+        self.runs: List[RunRecord] = []
+        self.lock = threading.RLock()  # the writer appends while the Tk thread queries
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.runs = [RunRecord(**r) for r in json.load(f)['runs']]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        for r in self.runs:
+            self.bests[r.difficulty] = max(self.bests.get(r.difficulty, 0), r.score)
+
+    def write(self, recs: List[RunRecord]):
+        with self.lock:
+            self.runs.extend(recs)
+            keep = {id(r) for d in DIFF_PRESETS for r in self.top(d, STORE_TOP)}
+            old = self.runs[:-STORE_JSON_RUNS]
+            self.runs = [r for r in old if id(r) in keep] + self.runs[-STORE_JSON_RUNS:]
+            data = {'runs': [r.__dict__ for r in self.runs]}
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def top(self, difficulty: int, n: int = 10) -> List[RunRecord]:
+        with self.lock:
+            return sorted((r for r in self.runs if r.difficulty == difficulty), key=lambda r: -r.score)[:n]
+
+    def recent(self, n: int = 20) -> List[RunRecord]:
+        with self.lock:
+            return sorted(self.runs, key=lambda r: -r.ended)[:n]
+
+
+def open_store(base: str = SCORES_BASE) -> ScoreStore:
+    """SQLite at `base`.sqlite3 if possible, else JSON at `base`.json. A
+    legacy single high score (HS_FILE) is carried over into an empty store
+    as a difficulty-2 run."""
+    store: Optional[ScoreStore] = None
+    if sqlite3 is not None:
+        try:
+            store = SqliteStore(base + '.sqlite3')
+        except sqlite3.Error:
+            store = None
+    if store is None:
+        store = JsonStore(base + '.json')
+    if not any(store.bests.values()):
+        try:
+            with open(HS_FILE, 'r', encoding='utf-8') as f:
+                high = int(json.load(f).get('high', 0))
+        except (OSError, ValueError, AttributeError):
+            high = 0
+        if high > 0:
+            store.add_run(RunRecord(2, high, 0.0, 0, 0, 'imported', 0, 0))
+            store.flush()  # committed before anyone queries the store
+    return store
+
+
+# ------------------------------ Audio --------------------------------------- #
+
+def synth_tone(freq: int, dur: int) -> array:
+    """`dur` ms of a sine at `freq` Hz as 16-bit samples, faded in and out
+    over a few ms so it starts and stops without a click."""
+    n = int(AUDIO_RATE * dur / 1000)
+    fade = max(1, min(n // 2, AUDIO_RATE // 200))
+    step = 2 * math.pi * freq / AUDIO_RATE
+    amp = AUDIO_VOLUME * 32767
+    out = array('h', bytes(2 * n))
+    for i in range(n):
+        out[i] = int(amp * min(1.0, i / fade, (n - i) / fade) * math.sin(step * i))
+    return out
+
+
+def wav_image(pcm: bytes) -> bytes:
+    """A complete in-memory WAV file around mono 16-bit PCM."""
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(AUDIO_RATE)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+class NullSink:
+    """Discards sound, counting what it was given (headless runs, tests)."""
+
+    def __init__(self):
+        self.buffers = 0
+        self.samples = 0
+
+    def play(self, pcm: bytes):
+        self.buffers += 1
+        self.samples += len(pcm) // 2
+
+    def close(self):
+        pass
+
+
+class WavSink:
+    """Writes every buffer, back to back, into one mono 16-bit WAV file."""
+
+    def __init__(self, path: str):
+        self.w = wave.open(path, 'wb')
+        self.w.setnchannels(1)
+        self.w.setsampwidth(2)
+        self.w.setframerate(AUDIO_RATE)
+
+    def play(self, pcm: bytes):
+        self.w.writeframes(pcm)
+
+    def close(self):
+        self.w.close()
+
+
+class WinsoundSink:
+    """Windows: plays each buffer with PlaySound (blocks the audio thread only)."""
+
+    def play(self, pcm: bytes):
+        winsound.PlaySound(wav_image(pcm), winsound.SND_MEMORY | winsound.SND_NODEFAULT)
+
+    def close(self):
+        pass
+
+
+class PipeSink:
+    """Streams raw PCM into the stdin of a player process, e.g. aplay."""
+
+    def __init__(self, cmd: List[str]):
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def play(self, pcm: bytes):
+        self.proc.stdin.write(pcm)
+        self.proc.stdin.flush()
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=1)
+        except Exception:
+            self.proc.kill()
+
+
+def default_sink():
+    if winsound is not None:
+        return WinsoundSink()
+    aplay = shutil.which('aplay')
+    if aplay:
+        try:
+            return PipeSink([aplay, '-q', '-t', 'raw', '-f', 'S16_LE', '-c', '1', '-r', str(AUDIO_RATE)])
+        except OSError:
+            pass
+    return NullSink()
+
+
+class Audio:
+    """Sound effects, played off the game thread.
+
+    `play` only notes a request. `flush`, called once per frame, hands the
+    frame's distinct requests to a worker thread as one batch, so a sound
+    asked for on several ticks of a frame plays once. The worker mixes a
+    batch into one buffer (tones are synthesised once per (freq, dur) and
+    cached, as are their mixes) and gives it to the sink, the only part
+    that may block. The game thread never waits: if the worker falls
+    behind, waiting batches are merged, and a full queue drops the batch.
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink  # default_sink() unless set before the first flush
+        self.pending: List[Tuple[int, int]] = []
+        self.queue: queue.Queue = queue.Queue(AUDIO_QUEUE)
+        self.thread: Optional[threading.Thread] = None
+        self.cache: Dict[Tuple[Tuple[int, int], ...], bytes] = {}
+        self.played = 0
+        self.dropped = 0
+
+    def play(self, freq: int, dur: int):
+        key = (freq, dur)
+        if key not in self.pending:
+            self.pending.append(key)
+
+    def flush(self):
+        if not self.pending:
+            return
+        batch = tuple(sorted(self.pending))
+        self.pending.clear()
+        if self.thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait(batch)
+        except queue.Full:
+            self.dropped += 1
+
+    def start(self):
+        if self.sink is None:
+            self.sink = default_sink()
+        self.thread = threading.Thread(target=self.run, name='audio', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        q = self.queue
+        stop = False
+        while not stop:
+            batch = q.get()
+            if batch is None:
+                break
+            # the sink fell behind: play everything still waiting as one batch
+            while not q.empty():
+                more = q.get_nowait()
+                if more is None:
+                    stop = True
+                    break
+                batch = tuple(sorted(set(batch) | set(more)))
+            try:
+                self.sink.play(self.tone(batch))
+            except Exception:
+                pass  # a broken output device must not take the game down
+            self.played += 1
+
+    def tone(self, batch: Tuple[Tuple[int, int], ...]) -> bytes:
+        pcm = self.cache.get(batch)
+        if pcm is None:
+            if len(batch) == 1:
+                pcm = synth_tone(*batch[0]).tobytes()
+            else:
+                parts = [array('h', self.tone((key,))) for key in batch]
+                mixed = array('h', bytes(2 * max(len(p) for p in parts)))
+                for p in parts:
+                    for i, v in enumerate(p):
+                        mixed[i] = int(clamp(mixed[i] + v, -32768, 32767))
+                pcm = mixed.tobytes()
+            self.cache[batch] = pcm
+        return pcm
+
+    def close(self):
+        """Play what is already queued, stop the worker and close the sink."""
+        self.flush()
+        if self.thread is not None:
+            try:
+                self.queue.put(None, timeout=1)
+            except queue.Full:
+                pass
+            self.thread.join(timeout=2)
+            self.thread = None
+        if self.sink is not None:
+            self.sink.close()
+
+
+AUDIO = Audio()
+
+
+def beep(freq: int = 440, dur: int = 80):
+    AUDIO.play(freq, dur)
 
 
 # ------------------------------ Game Class ---------------------------------- #
 
 class Game:
-    def __init__(self, root: tk.Tk):
-        self.root = root
-        self.root.title('Tkinter Dino Runner')
-        self.root.geometry(f'{W}x{H}')
-        self.root.resizable(False, False)
-
-        self.c = tk.Canvas(root, width=W, height=H, bg=DAY_SKY, highlightthickness=0)
-        self.c.pack(fill='both', expand=True)
+    """The simulation: all game state and rules, with no Tk dependency.
+
+    A `TkView` renders it and forwards input; headless runs just call
+    `step()`. The game advances in fixed ticks of STEP_MS and all its
+    timers read the game's GameClock, so a run plays the same
+    whether it is stepped at 60 Hz or as fast as the CPU allows. Every
+    random choice comes from the game's own `rng`, seeded with `seed`, so
+    the seed plus the input log (see InputLog) reproduces a run exactly.
+    Headless games neither beep nor keep scores unless given a `store`."""
+
+    def __init__(self, headless: bool = False, difficulty: int = 2, time_scale: float = 1.0,
+                 seed: Optional[int] = None, store: Optional[ScoreStore] = None):
+        self.headless = headless
+        self.clock = GameClock(time_scale)
+        if seed is not None and not 0 <= seed < SEED_RANGE:
+            raise ValueError(f'seed must be in 0..{SEED_RANGE - 1}')  # InputLog stores it as a uint32
+        self.seed = seed if seed is not None else random.randrange(SEED_RANGE)
+        self.rng = random.Random(self.seed)
+        self.recorder: Optional[InputLog] = None  # set to record this game's input
+        self.autopilot: Optional[Autopilot] = None  # set to let the game play itself
+        self.telemetry: Optional[Telemetry] = None  # see attach_telemetry
+        self.store = store if store is not None or headless else open_store()
 
         # State
-        self.running = True
         self.paused = False
         self.game_over = False
-        self.muted = False
-        self.debug = False
-        self.color_mode = 0  # 0 normal, 1 high-contrast
+        self.muted = headless
 
         # Difficulty
-        self.diff = 2
+        self.diff = int(clamp(difficulty, 1, 3))
         self.base_speed = DIFF_PRESETS[self.diff]['base_speed']
         self.speed = self.base_speed
         self.speed_scale = 1.0
         self.distance = 0.0
+        self.slowmo_on = False  # sampled once per tick so every entity scrolls alike
+        self.tick_speed = self.speed  # scroll speed of the current tick, see scroll_speed()
+        self.scroll = 0.0       # total world scroll; views move their world layer by the delta
+        self.prev_scroll = 0.0  # scroll before the last tick, for interpolation
 
         # Day/Night
         self.time_t = 0.0
-        self.sky = DAY_SKY
-        self.stars = [(random.randint(0, W), random.randint(0, H//2)) for _ in range(40)]
+        self.sky_idx = 0  # index into PALETTE.sky
 
         # Entities
         self.player = Player(self)
@@ -563,132 +1872,110 @@ class Game:
         self.obstacles: List[Obstacle] = []
         self.collectibles: List[Entity] = []
         self.powerups: List[PowerUp] = []
-        self.ground: List[GroundSeg] = []
-        self.spawn_ground()
+        self.retired: List[Entity] = []  # removed entities whose canvas items a view must delete
+        self.colliders = SweepIndex()    # obstacles, coins and power-ups, for check_collisions
+        self.touching: List[Entity] = []  # reused broad-phase result list
         self.clouds: List[Cloud] = [Cloud(self) for _ in range(3)]
-        self.particles: List[Particle] = []
+        self.particles = ParticleSystem(self.rng)
+        self.prof: Optional[FrameProfiler] = None  # attached by the view while profiling
+        # updated every tick; the lists themselves are only ever mutated in place
+        self.entity_lists = (self.clouds, self.obstacles, self.collectibles, self.powerups)
 
         # Score
         self.score = 0
-        self.high = self.load_high()
+        self.high = self.store.best(self.diff) if self.store else 0
         self.combo = 0
+        self.coins = 0
+        self.run_start = 0  # clock tick the current run started on
 
         # Timers
-        self.next_obstacle = Timer(self.rng_obs_interval())
-        self.next_coin = Timer(self.rng_coin_interval())
-        self.next_power = Timer(random.randint(9000, 14000))
+        self.next_obstacle = Timer(self.rng_obs_interval(), self.clock)
+        self.next_coin = Timer(self.rng_coin_interval(), self.clock)
+        self.next_power = Timer(self.rng.randint(9000, 14000), self.clock)
         self.slowmo_timer: Optional[Timer] = None
 
         # UI
-        self.banner_timer: Optional[Timer] = Timer(2500)
-
-        # Bindings
-        self.root.bind('<KeyPress>', self.on_key)
-        self.root.bind('<KeyRelease>', self.on_key_up)
-
-        # Main loop
-        self.last_ms = now_ms()
-        self.loop()
+        self.banner_timer: Optional[Timer] = Timer(2500, self.clock)
 
     # ------------------------- Persistence ---------------------------------- #
-    def load_high(self) -> int:
-        try:
-            if os.path.exists(HS_FILE):
-                with open(HS_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return int(data.get('high', 0))
-        except Exception:
-            pass
-        return 0
-
-    def save_high(self):
-        try:
-            with open(HS_FILE, 'w', encoding='utf-8') as f:
-                json.dump({'high': int(self.high)}, f)
-        except Exception:
-            pass
+    def attach_telemetry(self, tm: Optional[Telemetry]):
+        self.telemetry = tm
+        if tm:
+            tm.clock = self.clock
+            tm.emit(TM_RUN, self.diff)
+
+    def end_run(self, cause: str):
+        # queued for the store's writer thread; nothing here touches the disk
+        if self.score > self.high:
+            self.high = self.score
+        if self.store:
+            self.store.add_run(RunRecord(self.diff, self.score, self.distance, self.clock.ticks - self.run_start,
+                                         self.coins, cause, self.seed, self.run_start))
 
     # ------------------------- Spawning ------------------------------------- #
-    def spawn_ground(self):
-        self.ground.clear()
-        seg_w = 180
-        for i in range((W // seg_w) + 3):
-            x = i * seg_w
-            self.ground.append(GroundSeg(self, x=x, width=seg_w, speed_ref=self.get_speed))
-
     def rng_obs_interval(self) -> int:
         d = DIFF_PRESETS[self.diff]
-        return random.randint(d['obs_min'], d['obs_max'])
+        return self.rng.randint(d['obs_min'], d['obs_max'])
 
     def rng_coin_interval(self) -> int:
         d = DIFF_PRESETS[self.diff]
-        return random.randint(d['coin_min'], d['coin_max'])
+        return self.rng.randint(d['coin_min'], d['coin_max'])
 
     def get_speed(self) -> float:
-        s = self.speed * (0.5 if self.slowmo_timer and not self.slowmo_timer.done() else 1.0)
+        s = self.speed * (0.5 if self.slowmo_on else 1.0)
         return s
 
+    def scroll_speed(self) -> float:
+        # the speed_ref handed to entities: computed once per tick in update()
+        return self.tick_speed
+
     def maybe_spawn(self):
         if self.next_obstacle.done():
-            kind = random.choice(['cactus'] * 3 + ['bird'])
+            kind = self.rng.choice(['cactus'] * 3 + ['bird'])
             if kind == 'cactus':
-                self.obstacles.append(Cactus(self, self.get_speed))
+                o = Cactus(self, self.scroll_speed)
             else:
-                self.obstacles.append(Bird(self, self.get_speed))
+                o = Bird(self, self.scroll_speed)
+            self.obstacles.append(o)
+            self.colliders.add(o)
+            tm = self.telemetry
+            if tm:
+                tm.emit(TM_SPAWN, o.variant, self.tick_speed, o.box.y)
             self.next_obstacle.reset(self.rng_obs_interval())
 
         if self.next_coin.done():
-            self.collectibles.append(Coin(self, self.get_speed))
+            coin = Coin(self, self.scroll_speed)
+            self.collectibles.append(coin)
+            self.colliders.add(coin)
+            if self.telemetry:
+                self.telemetry.emit(TM_COIN_SPAWN, 0, self.tick_speed, coin.y)
             self.next_coin.reset(self.rng_coin_interval())
 
         if self.next_power.done():
-            if random.random() < 0.5:
-                self.powerups.append(ShieldPU(self, self.get_speed))
+            if self.rng.random() < 0.5:
+                pu = ShieldPU(self, self.scroll_speed)
             else:
-                self.powerups.append(SlowMoPU(self, self.get_speed))
-            self.next_power.reset(random.randint(12000, 18000))
+                pu = SlowMoPU(self, self.scroll_speed)
+            self.powerups.append(pu)
+            self.colliders.add(pu)
+            self.next_power.reset(self.rng.randint(12000, 18000))
 
         # Clouds occasionally
-        if random.random() < 0.015:
+        if self.rng.random() < 0.015:
             self.clouds.append(Cloud(self))
 
-        # Ground recycling
-        if len(self.ground) == 0 or (self.ground and self.ground[-1].x + self.ground[-1].w < W):
-            last_x = self.ground[-1].x + self.ground[-1].w if self.ground else 0
-            self.ground.append(GroundSeg(self, x=last_x, width=180, speed_ref=self.get_speed))
-
     # ------------------------- Effects -------------------------------------- #
     def emit_jump_dust(self, x: float, y: float):
-        for _ in range(6):
-            ang = random.uniform(-math.pi, 0)
-            sp = random.uniform(1, 3)
-            vx = math.cos(ang) * sp
-            vy = math.sin(ang) * sp
-            self.particles.append(Particle(self, x, y, vx, vy, life=random.randint(250, 450), size=random.randint(2, 3), color=GROUND_DARK))
+        self.particles.burst(x, y, 6, ang=(-math.pi, 0), speed=(1, 3), life=(250, 450), size=(2, 3), color=GROUND_DARK)
 
     def emit_land_dust(self, x: float, y: float):
-        for _ in range(10):
-            ang = random.uniform(math.pi, 2*math.pi)
-            sp = random.uniform(0.5, 2.2)
-            vx = math.cos(ang) * sp
-            vy = math.sin(ang) * sp
-            self.particles.append(Particle(self, x, y, vx, vy, life=random.randint(280, 520), size=random.randint(2, 4), color=GROUND_COLOR))
+        self.particles.burst(x, y, 10, ang=(math.pi, 2*math.pi), speed=(0.5, 2.2), life=(280, 520), size=(2, 4), color=GROUND_COLOR)
 
     def emit_spark(self, x: float, y: float, color: str = COIN_COLOR):
-        for _ in range(12):
-            ang = random.uniform(0, 2*math.pi)
-            sp = random.uniform(1.2, 3.8)
-            vx = math.cos(ang) * sp
-            vy = math.sin(ang) * sp
-            self.particles.append(Particle(self, x, y, vx, vy, life=random.randint(300, 600), size=random.randint(2, 3), color=color))
+        self.particles.burst(x, y, 12, ang=(0, 2*math.pi), speed=(1.2, 3.8), life=(300, 600), size=(2, 3), color=color)
 
     def emit_shield_burst(self, x: float, y: float):
-        for _ in range(16):
-            ang = random.uniform(0, 2*math.pi)
-            sp = random.uniform(1.0, 2.6)
-            vx = math.cos(ang) * sp
-            vy = math.sin(ang) * sp
-            self.particles.append(Particle(self, x, y, vx, vy, life=random.randint(500, 800), size=random.randint(2, 3), color=SHIELD_COLOR))
+        self.particles.burst(x, y, 16, ang=(0, 2*math.pi), speed=(1.0, 2.6), life=(500, 800), size=(2, 3), color=SHIELD_COLOR)
 
     # ------------------------- Audio ---------------------------------------- #
     def sfx_jump(self):
@@ -716,254 +2003,1219 @@ class Game:
             beep(150, 180)
 
     # ------------------------- Input ---------------------------------------- #
-    def on_key(self, e):
-        if e.keysym in ('space', 'Up'):
-            if self.game_over:
-                self.restart()
-            else:
-                self.player.jump()
-        elif e.keysym == 'Down':
-            self.player.set_duck(True)
-        elif e.keysym.lower() == 'p':
-            if not self.game_over:
-                self.paused = not self.paused
-        elif e.keysym.lower() == 'r':
+    # every input goes through these, so a recorder sees exactly what the
+    # simulation saw, stamped with the tick it was applied before
+    def record(self, code: int):
+        if self.recorder is not None:
+            self.recorder.add(self.clock.ticks, code)
+
+    def apply_input(self, code: int):
+        """Replay one recorded input event."""
+        if code == EV_JUMP:
+            self.press_jump()
+        elif code in (EV_DUCK, EV_STAND):
+            self.set_duck(code == EV_DUCK)
+        elif code == EV_PAUSE:
+            self.toggle_pause()
+        elif code == EV_RESTART:
+            self.press_restart()
+        elif code & EV_DIFFICULTY:
+            self.set_difficulty(code & ~EV_DIFFICULTY)
+
+    def press_jump(self):
+        self.record(EV_JUMP)
+        if self.game_over:
             self.restart()
-        elif e.keysym.lower() == 'm':
-            self.muted = not self.muted
-        elif e.keysym == 'F1':
-            self.debug = not self.debug
-        elif e.keysym.lower() == 'c':
-            self.color_mode = (self.color_mode + 1) % 2
-        elif e.keysym in ('1', '2', '3'):
-            self.set_difficulty(int(e.keysym))
+        else:
+            self.player.jump()
 
-    def on_key_up(self, e):
-        if e.keysym == 'Down':
-            self.player.set_duck(False)
+    def set_duck(self, down: bool):
+        self.record(EV_DUCK if down else EV_STAND)
+        self.player.set_duck(down)
+
+    def press_restart(self):
+        self.record(EV_RESTART)
+        self.restart()
+
+    def toggle_pause(self):
+        self.record(EV_PAUSE)
+        if not self.game_over:
+            self.paused = not self.paused
 
     # ------------------------- Difficulty ----------------------------------- #
     def set_difficulty(self, level: int):
+        self.record(EV_DIFFICULTY | level)
         self.diff = clamp(level, 1, 3)
+        if self.telemetry:
+            self.telemetry.emit(TM_DIFFICULTY, self.diff)
         d = DIFF_PRESETS[self.diff]
         self.base_speed = d['base_speed']
         self.speed = self.base_speed
+        if self.store:
+            self.high = self.store.best(self.diff)
         self.next_obstacle.reset(self.rng_obs_interval())
         self.next_coin.reset(self.rng_coin_interval())
-        self.banner_timer = Timer(1500)
+        self.banner_timer = Timer(1500, self.clock)
 
     # ------------------------- Game Control --------------------------------- #
     def activate_slowmo(self):
-        self.slowmo_timer = Timer(3500)
+        self.slowmo_timer = Timer(3500, self.clock)
 
     def check_collisions(self):
-        pr = self.player.rect().inset(2, 2)
-        for o in list(self.obstacles):
-            if pr.intersects(o.rect()):
-                if self.player.hit():
+        # broad phase: only entities overlapping the player's column
+        p = self.player
+        box, hitbox = p.box, p.hitbox
+        self.colliders.refresh()
+        hit_obstacle = False
+        for e in self.colliders.query(box.x, box.x + box.w, self.touching):
+            if isinstance(e, Obstacle):
+                if hit_obstacle or not hitbox.intersects(e.box):
+                    continue
+                hit_obstacle = True
+                if p.hit():
                     self.game_over = True
                     self.sfx_hit()
-                    self.save_high_if_needed()
+                    if self.telemetry:
+                        self.telemetry.emit(TM_DEATH, e.variant, self.tick_speed, self.score)
+                    self.end_run(type(e).__name__.lower())
                 else:
                     # consume obstacle if shielded
-                    o.dead = True
-                    self.emit_spark(o.rect().x + 6, o.rect().y + 6)
-                break
-
-    def save_high_if_needed(self):
-        if self.score > self.high:
-            self.high = self.score
-            self.save_high()
+                    e.dead = True
+                    self.emit_spark(e.box.x + 6, e.box.y + 6)
+            elif box.intersects(e.box):
+                e.collect()
 
     def update_speed(self, dt: float):
         # Speed slowly ramps with distance
         self.distance += self.get_speed()
-        target = self.base_speed + min(6.0, self.distance / 1800.0)  # cap growth
+        target = self.base_speed + min(SPEED_RAMP_CAP, self.distance / SPEED_RAMP_DIST)  # cap growth
         self.speed = lerp(self.speed, target, 0.02)
         # periodic tiny wobble for feel
         self.speed += 0.07 * math.sin(self.distance / 240.0)
-        self.speed = clamp(self.speed, 4.0, 16.0)
+        self.speed = clamp(self.speed, MIN_SPEED, MAX_SPEED)
 
     def update_time_of_day(self):
         # cycle every ~45 seconds
         self.time_t += 0.002
         phase = (math.sin(self.time_t) + 1) / 2
-        self.sky = blend_hex(DAY_SKY, NIGHT_SKY, phase)
+        self.sky_idx = Palette.sky_index(phase)
 
     def update(self, dt: float):
+        prof = self.prof
+        if self.autopilot is not None and not self.paused:
+            # decides through the input methods, before the tick it acts on
+            self.autopilot.act()
+            if prof:
+                prof.mark('autopilot')
         if self.paused or self.game_over:
             return
 
+        self.clock.advance()
+        self.slowmo_on = bool(self.slowmo_timer and not self.slowmo_timer.done())
         self.update_speed(dt)
+        self.tick_speed = self.get_speed()
+        self.prev_scroll = self.scroll
+        self.scroll += self.tick_speed
         self.update_time_of_day()
+        if prof:
+            prof.mark('speed')
         self.maybe_spawn()
-
-        # Update entities
-        self.player.update(dt)
-
-        for arr in (self.clouds, self.ground, self.obstacles, self.collectibles, self.powerups, self.particles):
-            for e in list(arr):
+        if prof:
+            prof.mark('spawn')
+
+        # Update entities (remembering where they were, for interpolation)
+        p = self.player
+        p.px, p.py = p.x, p.y
+        p.update(dt)
+
+        for arr in self.entity_lists:
+            # entity updates never add to these lists, so no copy is needed
+            for e in arr:
+                e.px, e.py = e.x, e.y
                 e.update(dt)
-            arr[:] = [e for e in arr if not e.dead]
+            self.compact(arr)
+        if prof:
+            prof.mark('entities')
+        self.particles.update()
+        if prof:
+            prof.mark('particles')
 
         # collisions
         self.check_collisions()
+        if prof:
+            prof.mark('collisions')
 
         # scoring (distance)
-        self.score += int(self.get_speed() * 0.2)
-        if self.score % 500 == 0:
-            # celebratory ping
+        before = self.score
+        self.score += int(self.tick_speed * 0.2)
+        if self.score // 500 != before // 500:
+            # celebratory ping, once per 500 points crossed
             self.sfx_coin()
 
-    def draw_background(self):
-        # sky
-        bg = self.sky if self.color_mode == 0 else invert_hex(self.sky)
-        self.c.create_rectangle(0, 0, W, H, fill=bg, outline='')
-        # stars at night
-        night_k = hex_mix_ratio(self.sky, NIGHT_SKY)
-        if night_k > 0.6:
-            for (sx, sy) in self.stars:
-                if random.random() < 0.97:
-                    self.c.create_oval(sx, sy, sx + 1.8, sy + 1.8, fill=STAR_COLOR, outline='')
-        # clouds
-        for cl in self.clouds:
-            cl.draw()
-
-    def draw_ground(self):
-        for g in self.ground:
-            g.draw()
-        # baseline
-        self.c.create_line(0, GROUND_Y + 6, W, GROUND_Y + 6, fill=GROUND_DARK)
-
-    def draw_entities(self):
-        for a in self.collectibles:
-            a.draw()
-        for p in self.powerups:
-            p.draw()
-        for o in self.obstacles:
-            o.draw()
-        self.player.draw()
-        for p in self.particles:
-            p.draw()
-
-    def draw_ui(self):
-        txt = f"Score: {self.score:06d}    High: {self.high:06d}"
-        color = TEXT_COLOR if self.color_mode == 0 else TEXT_INV
-        self.c.create_text(W - 10, 18, text=txt, anchor='ne', font=('Consolas', 12, 'bold'), fill=color)
-
-        if self.banner_timer and not self.banner_timer.done():
-            t = 1.0 - self.banner_timer.progress()
-            msg = f"Difficulty {self.diff}  |  P:Pause  R:Restart  M:Mute  F1:Debug  C:Contrast"
-            self.c.create_text(W/2, 40, text=msg, fill=color, font=('Consolas', 12, 'bold'))
-
-        if self.paused:
-            self.c.create_rectangle(W/2 - 120, H/2 - 50, W/2 + 120, H/2 + 50, fill=blend_hex(self.sky, '#000000', 0.35), outline='')
-            self.c.create_text(W/2, H/2 - 10, text='PAUSED', font=('Consolas', 18, 'bold'), fill=color)
-            self.c.create_text(W/2, H/2 + 14, text='Press P to resume', font=('Consolas', 11), fill=color)
-
-        if self.game_over:
-            self.c.create_rectangle(W/2 - 150, H/2 - 60, W/2 + 150, H/2 + 60, fill=blend_hex(self.sky, '#000000', 0.35), outline='')
-            self.c.create_text(W/2, H/2 - 16, text='GAME OVER', font=('Consolas', 20, 'bold'), fill=color)
-            self.c.create_text(W/2, H/2 + 12, text='Press R to restart', font=('Consolas', 11), fill=color)
-
-        if self.debug:
-            dbg = [
-                f"Entities: obs={len(self.obstacles)} col={len(self.collectibles)} pwr={len(self.powerups)} parts={len(self.particles)}",
-                f"Speed: {self.get_speed():.2f} (base {self.base_speed:.1f}) dist={self.distance:.0f}",
-                f"Player y={self.player.y:.1f} vy={self.player.vy:.2f} on_ground={self.player.on_ground} duck={self.player.ducking}",
-                f"SlowMo: {'ON' if (self.slowmo_timer and not self.slowmo_timer.done()) else 'off'}",
-            ]
-            y = H - 56
-            for line in dbg:
-                self.c.create_text(10, y, text=line, anchor='nw', fill=color, font=('Consolas', 10))
-                y += 14
-
-    def draw(self):
-        self.c.delete('all')
-        self.draw_background()
-        self.draw_ground()
-        self.draw_entities()
-        self.draw_ui()
-
-    def loop(self):
-        if not self.running:
-            return
-        ms = now_ms()
-        dt = (ms - self.last_ms) / 16.6667  # normalize to ~60fps units
-        self.last_ms = ms
-        try:
-            self.update(dt)
-            self.draw()
-        except Exception as e:
-            # Fail-safe overlay
-            self.c.delete('all')
-            self.c.create_text(W/2, H/2 - 20, text='An error occurred', font=('Consolas', 16, 'bold'), fill='red')
-            self.c.create_text(W/2, H/2 + 10, text=str(e), font=('Consolas', 10), fill='red')
-        finally:
-            self.root.after(DT_MS, self.loop)
-
     def restart(self):
         self.paused = False
         self.game_over = False
         self.score = 0
+        self.coins = 0
+        self.run_start = self.clock.ticks
         self.distance = 0
         self.speed = self.base_speed
         self.slowmo_timer = None
+        self.slowmo_on = False
+        self.tick_speed = self.speed
 
+        for arr in self.entity_lists:
+            self.retire(arr)
+        self.retire((self.player,))
         self.player = Player(self)
         self.obstacles.clear()
         self.collectibles.clear()
         self.powerups.clear()
+        self.colliders.clear()
         self.particles.clear()
-        self.clouds = [Cloud(self) for _ in range(2)]
-        self.spawn_ground()
+        self.clouds.clear()
+        self.clouds.extend(Cloud(self) for _ in range(2))
         self.next_obstacle.reset(self.rng_obs_interval())
         self.next_coin.reset(self.rng_coin_interval())
-        self.next_power.reset(random.randint(9000, 14000))
+        self.next_power.reset(self.rng.randint(9000, 14000))
+        tm = self.telemetry
+        if tm:
+            tm.run += 1
+            tm.emit(TM_RUN, self.diff)
+
+    def step(self, n: int = 1):
+        """Advance the simulation by `n` ticks (headless driver entry point)."""
+        for _ in range(n):
+            self.update(1.0)
 
     # ------------------------- Helpers -------------------------------------- #
-    def end(self):  # pragma: no cover
-        self.running = False
-        self.root.destroy()
+    def compact(self, arr: List[Entity]):
+        # swap-remove dead entities in place; order within a list is not kept
+        i = 0
+        n = len(arr)
+        while i < n:
+            e = arr[i]
+            if e.dead:
+                if e.items:
+                    self.retired.append(e)
+                n -= 1
+                arr[i] = arr[n]
+                arr.pop()
+            else:
+                i += 1
+
+    def retire(self, entities):
+        # hand drawn entities over to the view so it can delete their items
+        self.retired.extend(e for e in entities if e.items)
+
+    def state_hash(self) -> bytes:
+        """8-byte digest of the simulation state, for checking replays."""
+        p = self.player
+        state = (
+            self.clock.ticks, self.score, self.distance, self.speed, self.scroll, self.diff,
+            self.paused, self.game_over, self.time_t,
+            p.x, p.y, p.vy, p.on_ground, p.ducking, p.shield,
+            [(type(e).__name__, e.x, e.y) for arr in self.entity_lists for e in arr],
+            len(self.particles), self.rng.getstate(),
+        )
+        return hashlib.blake2b(repr(state).encode(), digest_size=8).digest()
+
+# ------------------------------ Replay -------------------------------------- #
+
+class InputLog:
+    """A game's seed plus every input event, keyed by tick, in a compact
+    binary form.
+
+    Layout: a '<4sBBI' header (magic, version, starting difficulty, seed);
+    then one record per event, the ticks since the previous event as a
+    LEB128 varint followed by a one-byte EV_* code; then EV_END (whose delta
+    gives the final tick) and a '<q8s' footer with the final score and
+    state hash, so a replay can check it ends where the recording did.
+    """
+
+    HEADER = struct.Struct('<4sBBI')
+    FOOTER = struct.Struct('<q8s')
+
+    def __init__(self, seed: int, difficulty: int):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.ticks = array('Q')
+        self.codes = bytearray()
+        self.end_tick = 0
+        self.score = 0
+        self.digest = b''
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def add(self, tick: int, code: int):
+        self.ticks.append(tick)
+        self.codes.append(code)
+
+    def finish(self, game: 'Game'):
+        self.end_tick = game.clock.ticks
+        self.score = game.score
+        self.digest = game.state_hash()
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(self.HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.difficulty, self.seed))
+        last = 0
+        for tick, code in zip(list(self.ticks) + [self.end_tick], bytes(self.codes) + bytes([EV_END])):
+            delta = tick - last
+            last = tick
+            while delta >= 0x80:
+                out.append(delta & 0x7f | 0x80)
+                delta >>= 7
+            out.append(delta)
+            out.append(code)
+        out += self.FOOTER.pack(self.score, self.digest)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'InputLog':
+        magic, version, difficulty, seed = cls.HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError('not a Dino Runner replay (or an unsupported version)')
+        log = cls(seed, difficulty)
+        pos = cls.HEADER.size
+        tick = 0
+        while True:
+            delta = shift = 0
+            while True:
+                b = data[pos]
+                pos += 1
+                delta |= (b & 0x7f) << shift
+                shift += 7
+                if b < 0x80:
+                    break
+            tick += delta
+            code = data[pos]
+            pos += 1
+            if code == EV_END:
+                break
+            log.add(tick, code)
+        log.end_tick = tick
+        log.score, log.digest = cls.FOOTER.unpack_from(data, pos)
+        return log
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'InputLog':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def replay(log: InputLog) -> Game:
+    """Re-run a recorded game headlessly, as fast as the CPU allows, and
+    return it in its final state (compare `state_hash()` with `log.digest`)."""
+    game = Game(headless=True, difficulty=log.difficulty, seed=log.seed)
+    ticks, codes = log.ticks, log.codes
+    i, n = 0, len(codes)
+    while True:
+        now = game.clock.ticks
+        # events were applied between ticks, before the update of tick `now`
+        while i < n and ticks[i] == now:
+            game.apply_input(codes[i])
+            i += 1
+        if now >= log.end_tick:
+            break
+        game.update(1.0)
+        if game.clock.ticks == now and (i >= n or ticks[i] != now):
+            break  # paused or over with no input left to resume it: a truncated log
+    return game
+
+
+# ------------------------------ Autopilot ----------------------------------- #
+
+class Autopilot:
+    """Plays a `Game` by itself, for demos and soak runs.
+
+    It acts only through the game's input methods, so a recorder logs its
+    moves like a player's. A jump always follows the same arc, so the arcs
+    of a normal and a ducked jump are simulated once into tables of
+    (hitbox top, hitbox height) per tick, take-off to landing. Each tick on
+    the ground, the visible obstacles are projected forward at the scroll
+    speed and a few plans are checked against them straight from the
+    tables: keep running, duck, jump on a later tick, jump now, ducked
+    jump. The first plan that stays clear over AUTOPILOT_HORIZON ticks is
+    taken; jumps wait for the last tick that still clears, which lands
+    soonest after the obstacle. After a game over it restarts once
+    AUTOPILOT_RESTART_TICKS have passed.
+    """
+
+    def __init__(self, game: Game):
+        self.g = game
+        gravity = GRAVITY * game.speed_scale
+        self.arcs = (self.arc(False, gravity), self.arc(True, gravity))
+        self.run_box = (GROUND_Y - RUN_HEIGHT + 2, RUN_HEIGHT - 4)
+        self.duck_box = (GROUND_Y - DUCK_HEIGHT + 2, DUCK_HEIGHT - 4)
+        self.ahead: List[Tuple[int, int, float, float]] = []  # (first tick, end tick, top, bottom), reused
+        self.shift = [0.0] * AUTOPILOT_HORIZON  # world scroll after each of the next ticks
+        self.over_ticks = 0
+        # decision timing, for the debug HUD and soak runs
+        self.decisions = 0
+        self.total_ns = 0
+        self.worst_ns = 0
 
-# ------------------------------ Color Utils -------------------------------- #
+    @staticmethod
+    def arc(ducked: bool, gravity: float) -> List[Tuple[float, float]]:
+        # mirrors Player.jump and Player.update; the landing tick is not included
+        ground = GROUND_Y - (DUCK_HEIGHT if ducked else RUN_HEIGHT)
+        y, vy = ground, JUMP_VELOCITY * (0.88 if ducked else 1.0)
+        boxes = []
+        while True:
+            vy += gravity
+            y += vy
+            if y >= ground:
+                return boxes
+            boxes.append((y + 2, RUN_HEIGHT - 4))
+
+    def act(self):
+        g = self.g
+        if g.game_over:
+            self.over_ticks += 1
+            if self.over_ticks >= AUTOPILOT_RESTART_TICKS:
+                self.over_ticks = 0
+                g.press_restart()
+            return
+        p = g.player
+        if not p.on_ground:
+            return  # nothing to decide until it lands
+        t0 = time.perf_counter_ns()
+        self.decide(g, p)
+        ns = time.perf_counter_ns() - t0
+        self.decisions += 1
+        self.total_ns += ns
+        if ns > self.worst_ns:
+            self.worst_ns = ns
+
+    def decide(self, g: Game, p: Player):
+        run, duck, (jump, duck_jump) = self.run_box, self.duck_box, self.arcs
+        danger = self.hit(run, AUTOPILOT_HORIZON, None, run) if self.project(g) else -1
+        if danger < 0:
+            if p.ducking:
+                g.set_duck(False)
+            return
+        if self.hit(duck, AUTOPILOT_HORIZON, None, duck) < 0:
+            if not p.ducking:
+                g.set_duck(True)
+            return
+        for wait in range(1, danger + 1):
+            if self.hit(run, wait, jump, run) < 0:
+                if p.ducking:
+                    g.set_duck(False)
+                return  # a later jump still clears: keep running until the last one
+        if self.hit(run, 0, jump, run) < 0 or self.hit(duck, 0, duck_jump, duck) >= 0:
+            if p.ducking:
+                g.set_duck(False)
+            g.press_jump()  # the last safe tick, or no plan is safe and this is the best try
+        else:
+            if not p.ducking:
+                g.set_duck(True)
+            g.press_jump()
+
+    def project(self, g: Game) -> bool:
+        """Work out, for each visible obstacle the player has not yet
+        passed, the span of coming ticks during which it overlaps the
+        player's column (into `ahead`); False if there are none."""
+        # slow motion halves the scroll until its timer runs out
+        t = g.slowmo_timer
+        slow_end = t.start_ms + t.duration if t else 0.0
+        tick = g.clock.ticks
+        speed = g.speed
+        acc = 0.0
+        shift = self.shift
+        for k in range(AUTOPILOT_HORIZON):
+            acc += speed * 0.5 if (tick + k + 1) * STEP_MS < slow_end else speed
+            shift[k] = acc
+
+        ahead = self.ahead
+        ahead.clear()
+        left, right = PLAYER_X - 12 - AUTOPILOT_MARGIN, PLAYER_X + 12 + AUTOPILOT_MARGIN
+        for o in g.obstacles:
+            b = o.box
+            if b.x >= W or b.x + b.w <= left:
+                continue
+            f = 1.15 if isinstance(o, Bird) else 1.0
+            k = 0
+            while k < AUTOPILOT_HORIZON and b.x - shift[k] * f >= right:
+                k += 1
+            k0 = k
+            while k < AUTOPILOT_HORIZON and b.x + b.w - shift[k] * f > left:
+                k += 1
+            if k0 < k:
+                ahead.append((k0, k, b.y, b.y + b.h))
+        return bool(ahead)
+
+    def hit(self, pre: Tuple[float, float], wait: int, arc: Optional[List[Tuple[float, float]]],
+            rest: Tuple[float, float]) -> int:
+        """The first coming tick at which holding hitbox `pre` for `wait`
+        ticks, then following `arc`, then holding `rest` touches an
+        obstacle in `ahead`; -1 if none does."""
+        n = len(arc) if arc else 0
+        first = AUTOPILOT_HORIZON
+        for k0, k1, y, bottom in self.ahead:
+            for k in range(k0, min(k1, first)):
+                i = k - wait
+                top, h = pre if i < 0 else arc[i] if i < n else rest
+                if top < bottom and top + h > y:
+                    first = k
+                    break
+        return first if first < AUTOPILOT_HORIZON else -1
+
+
+# ------------------------------ Sprites ------------------------------------- #
+
+class Raster:
+    """Tiny software rasteriser used to bake sprites.
+
+    Shapes are given in entity-local coordinates (the same numbers the old
+    canvas primitives used relative to the entity's x/y) and a pixel is
+    painted when its centre falls inside the shape. `x0`/`y0` is where the
+    image's top-left corner sits relative to the entity.
+    """
+
+    def __init__(self, x0: float, y0: float, x1: float, y1: float):
+        self.x0, self.y0 = math.floor(x0), math.floor(y0)
+        self.w = max(1, math.ceil(x1) - self.x0)
+        self.h = max(1, math.ceil(y1) - self.y0)
+        self.px: List[List[Optional[str]]] = [[None] * self.w for _ in range(self.h)]
+
+    def _paint(self, inside: Callable[[float, float], bool], color: str,
+               x1: float, y1: float, x2: float, y2: float):
+        # visit only the pixels of the shape's bounding box
+        c1 = max(0, math.floor(x1) - self.x0)
+        c2 = min(self.w, math.ceil(x2) - self.x0 + 1)
+        r1 = max(0, math.floor(y1) - self.y0)
+        r2 = min(self.h, math.ceil(y2) - self.y0 + 1)
+        for row in range(r1, r2):
+            y = self.y0 + row + 0.5
+            line = self.px[row]
+            for col in range(c1, c2):
+                if inside(self.x0 + col + 0.5, y):
+                    line[col] = color
+
+    def rect(self, x1: float, y1: float, x2: float, y2: float, color: str):
+        self._paint(lambda x, y: x1 <= x < x2 and y1 <= y < y2, color, x1, y1, x2, y2)
+
+    def oval(self, x1: float, y1: float, x2: float, y2: float, fill: str = '', outline: str = '', width: float = 1):
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        rx, ry = max(0.01, (x2 - x1) / 2), max(0.01, (y2 - y1) / 2)
+
+        def norm(x, y, grow):
+            return ((x - cx) / (rx + grow)) ** 2 + ((y - cy) / (ry + grow)) ** 2
+
+        if fill:
+            self._paint(lambda x, y: norm(x, y, 0) <= 1, fill, x1, y1, x2, y2)
+        if outline:
+            hw = width / 2
+            self._paint(lambda x, y: norm(x, y, hw) <= 1 and (rx <= hw or ry <= hw or norm(x, y, -hw) > 1),
+                        outline, x1 - hw, y1 - hw, x2 + hw, y2 + hw)
+
+    def polygon(self, pts: List[Tuple[float, float]], color: str):
+        def inside(x, y):
+            hit = False
+            j = len(pts) - 1
+            for i in range(len(pts)):
+                xi, yi = pts[i]
+                xj, yj = pts[j]
+                if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                    hit = not hit
+                j = i
+            return hit
+
+        xs = [p[0] for p in pts]
+        ys = [p[1] for p in pts]
+        self._paint(inside, color, min(xs), min(ys), max(xs), max(ys))
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, color: str, width: float = 1):
+        hw = width / 2
+        dx, dy = x2 - x1, y2 - y1
+        ll = dx * dx + dy * dy or 1.0
+
+        def inside(x, y):
+            t = clamp(((x - x1) * dx + (y - y1) * dy) / ll, 0.0, 1.0)
+            ex, ey = x1 + t * dx - x, y1 + t * dy - y
+            return ex * ex + ey * ey <= hw * hw
+
+        self._paint(inside, color, min(x1, x2) - hw, min(y1, y2) - hw, max(x1, x2) + hw, max(y1, y2) + hw)
+
+    def image(self) -> 'tk.PhotoImage':
+        import tkinter as tk
+
+        img = tk.PhotoImage(width=self.w, height=self.h)
+        # one put per horizontal run of a colour; unpainted pixels stay transparent
+        for row, line in enumerate(self.px):
+            col = 0
+            while col < self.w:
+                color = line[col]
+                end = col + 1
+                while end < self.w and line[end] == color:
+                    end += 1
+                if color:
+                    img.put(color, to=(col, row, end, row + 1))
+                col = end
+        return img
+
+
+class Sprite:
+    __slots__ = ('image', 'ox', 'oy')
+
+    def __init__(self, raster: Raster):
+        self.image = raster.image()
+        self.ox, self.oy = raster.x0, raster.y0  # image top-left relative to the entity
+
+
+class SpriteAtlas:
+    """Pre-rasterised entity images, baked lazily on first use.
+
+    Cacti come in a fixed set of sizes, and bird wings, coin spin and the
+    player's legs cycle through a few frames, so each variant is drawn once
+    into a PhotoImage and every entity is a single canvas image item.
+    """
+
+    BIRD_FRAMES = 12
+    COIN_FRAMES = 12
+
+    def __init__(self):
+        self.cache: Dict[tuple, Sprite] = {}
+
+    def _get(self, key: tuple, bake: Callable[[], Raster]) -> Sprite:
+        sprite = self.cache.get(key)
+        if sprite is None:
+            sprite = self.cache[key] = Sprite(bake())
+        return sprite
+
+    def cactus(self, w: int, h: int) -> Sprite:
+        return self._get(('cactus', w, h), lambda: self._bake_cactus(w, h))
+
+    def bird(self, flap_t: float) -> Sprite:
+        n = self.BIRD_FRAMES
+        frame = int((flap_t % math.tau) / math.tau * n) % n
+        return self._get(('bird', frame), lambda: self._bake_bird(frame))
+
+    def coin(self, spin: float) -> Sprite:
+        n = self.COIN_FRAMES
+        frame = int((spin % math.tau) / math.tau * n) % n
+        return self._get(('coin', frame), lambda: self._bake_coin(frame))
+
+    def cloud(self, scale: float) -> Sprite:
+        return self._get(('cloud', scale), lambda: self._bake_cloud(scale))
+
+    def ground(self) -> Sprite:
+        return self._get(('ground',), self._bake_ground)
+
+    def player(self, h: float, legs: int, head_r: int, color: str, shield: bool) -> Sprite:
+        key = ('player', h, legs, head_r, color, shield)
+        return self._get(key, lambda: self._bake_player(h, legs, head_r, color, shield))
+
+    # --- baking (shapes match the former canvas primitives) --------------- #
+    @staticmethod
+    def _bake_cactus(w: int, h: int) -> Raster:
+        y1, y2 = 44 - h, h
+        arm_h = h * 0.35
+        r = Raster(-6, y1, w + 6, max(y2, y1 + 10 + arm_h))
+        r.rect(0, y1, w, y2, CACTUS_COLOR)
+        if w >= 26:
+            r.rect(-6, y1 + 10, 2, y1 + 10 + arm_h, CACTUS_COLOR)
+        if w >= 32:
+            r.rect(w - 2, y1 + 6, w + 6, y1 + 6 + arm_h, CACTUS_COLOR)
+        return r
 
-def hex_to_rgb(hx: str) -> Tuple[int, int, int]:
-    hx = hx.lstrip('#')
-    return tuple(int(hx[i:i+2], 16) for i in (0, 2, 4))  # type: ignore
+    @staticmethod
+    def _bake_cloud(scale: float) -> Raster:
+        s = 20 * scale
+        r = Raster(-s, -0.5 * s, 4 * s, 2.2 * s)
+        r.oval(0, 0, 3 * s, 2 * s, fill=CLOUD_COLOR)
+        r.oval(2 * s, -0.5 * s, 4 * s, 1.5 * s, fill=CLOUD_COLOR)
+        r.oval(-s, 0.3 * s, s, 2.2 * s, fill=CLOUD_COLOR)
+        return r
 
+    @staticmethod
+    def _bake_ground() -> Raster:
+        # W plus one tile, so shifting left by up to a tile never shows a gap
+        r = Raster(0, 0, W + GROUND_TILE, 6)
+        r.rect(0, 0, W + GROUND_TILE, 6, GROUND_COLOR)
+        bw = GROUND_TILE / 8
+        for t in range(0, W + GROUND_TILE, GROUND_TILE):
+            for i in range(5):
+                bx = t + (i + 0.5) * GROUND_TILE / 5
+                r.rect(bx, 3, bx + bw, 6, GROUND_DARK)
+        return r
+
+    @classmethod
+    def _bake_bird(cls, frame: int) -> Raster:
+        spread = 10 + 8 * math.sin((frame + 0.5) / cls.BIRD_FRAMES * math.tau)
+        r = Raster(-18, 0, 38, 24)
+        r.oval(0, 0, 38, 24, fill=BIRD_COLOR)
+        r.polygon([(10, 12), (-spread, 2), (-spread, 22)], BIRD_COLOR)
+        return r
+
+    @classmethod
+    def _bake_coin(cls, frame: int) -> Raster:
+        rad = 9
+        phase = (math.sin((frame + 0.5) / cls.COIN_FRAMES * math.tau) + 1) / 2
+        rx = lerp(rad * 0.4, rad, phase)
+        r = Raster(-rad - 1, -rad - 1, rad + 1, rad + 1)
+        r.oval(-rx, -rad, rx, rad, fill=COIN_COLOR, outline='#d4a52f', width=2)
+        r.oval(-rx * 0.5, -rad * 0.5, rx * 0.5, rad * 0.5, outline='#d4a52f')
+        return r
 
-def rgb_to_hex(r: int, g: int, b: int) -> str:
-    return f"#{r:02x}{g:02x}{b:02x}"
+    @staticmethod
+    def _bake_player(h: float, legs: int, head_r: int, color: str, shield: bool) -> Raster:
+        # entity origin is the top-centre of the body
+        r = Raster(-21, -10, 21, h + 12)
+        r.rect(-14, 0, 14, h, color)
+        if legs >= 0:
+            d = -6 if legs == 0 else 6
+            r.line(-10, h, -10 + d, h + 10, '#000000', 3)
+            r.line(10, h, 10 - d, h + 10, '#000000', 3)
+        r.oval(4 - head_r, -head_r, 4 + head_r, head_r, fill=color)
+        r.oval(6, -3, 9, 0, fill='#111111')
+        if shield:
+            r.oval(-20, -8, 20, h + 6, outline=SHIELD_COLOR, width=2)
+        return r
+
+
+SPRITES = SpriteAtlas()
+
+# ------------------------------ Tk View ------------------------------------- #
+
+class Hud:
+    """Score line, banner, pause/game-over panels and the debug lines.
+
+    Every item is created once; `update` re-formats a string only when the
+    values behind it change, calls itemconfigure only when the string does,
+    and shows or hides the overlays with their `state`.
+    """
+
+    def __init__(self, c: tk.Canvas):
+        self.c = c
+        self.strings: Dict[int, str] = {}   # text each item currently shows
+        self.shown: Dict[str, bool] = {}    # overlay tag -> visible
+        self.values: Dict[str, tuple] = {}  # values each string was last formatted from
+        self.color = TEXT_COLOR
+        self.panel_fill = ''
+
+        def text(x, y, font, tag, **kw):
+            return c.create_text(x, y, text='', font=font, fill=self.color, tags=('hud', 'hud_text', tag), **kw)
+
+        def panel(hw, hh, tag):
+            c.create_rectangle(W/2 - hw, H/2 - hh, W/2 + hw, H/2 + hh, outline='', tags=('hud', 'hud_panel', tag))
+
+        self.score = text(W - 10, 18, ('Consolas', 12, 'bold'), 'hud_score', anchor='ne')
+        self.banner = text(W/2, 40, ('Consolas', 12, 'bold'), 'hud_banner')
+        panel(120, 50, 'hud_pause')
+        self.set(text(W/2, H/2 - 10, ('Consolas', 18, 'bold'), 'hud_pause'), 'PAUSED')
+        self.set(text(W/2, H/2 + 14, ('Consolas', 11), 'hud_pause'), 'Press P to resume')
+        panel(150, 60, 'hud_over')
+        self.set(text(W/2, H/2 - 16, ('Consolas', 20, 'bold'), 'hud_over'), 'GAME OVER')
+        self.set(text(W/2, H/2 + 12, ('Consolas', 11), 'hud_over'), 'Press R to restart')
+        self.debug = [text(10, H - 56 + 14*i, ('Consolas', 10), 'hud_debug', anchor='nw') for i in range(4)]
+        self.prof = text(10, 8, ('Consolas', 9), 'hud_debug', anchor='nw')
+        for tag in ('hud_banner', 'hud_pause', 'hud_over', 'hud_debug'):
+            c.itemconfigure(tag, state='hidden')
+            self.shown[tag] = False
+
+    def set(self, item: int, s: str):
+        if self.strings.get(item) != s:
+            self.strings[item] = s
+            self.c.itemconfigure(item, text=s)
+
+    def changed(self, key: str, vals: tuple) -> bool:
+        if self.values.get(key) == vals:
+            return False
+        self.values[key] = vals
+        return True
+
+    def show(self, tag: str, on: bool):
+        if self.shown[tag] != on:
+            self.shown[tag] = on
+            self.c.itemconfigure(tag, state='normal' if on else 'hidden')
+
+    def update(self, g: 'Game', color: str, debug: bool, prof: Optional[FrameProfiler] = None):
+        c = self.c
+        if color != self.color:
+            self.color = color
+            c.itemconfigure('hud_text', fill=color)
+        auto = g.autopilot is not None
+        if self.changed('score', (g.score, g.high, auto)):
+            self.set(self.score, f"{'AUTO    ' if auto else ''}Score: {g.score:06d}    High: {g.high:06d}")
+
+        banner = bool(g.banner_timer) and not g.banner_timer.done()
+        self.show('hud_banner', banner)
+        if banner and self.changed('banner', (g.diff,)):
+            self.set(self.banner, f"Difficulty {g.diff}  |  P:Pause  R:Restart  M:Mute  F1:Debug  C:Contrast  A:Auto")
+
+        self.show('hud_pause', g.paused)
+        self.show('hud_over', g.game_over)
+        if g.paused or g.game_over:
+            fill = PALETTE.panel[g.sky_idx]
+            if fill is not self.panel_fill:
+                self.panel_fill = fill
+                c.itemconfigure('hud_panel', fill=fill)
+
+        self.show('hud_debug', debug)
+        if debug:
+            p = g.player
+            slowmo = bool(g.slowmo_timer) and not g.slowmo_timer.done()
+            if self.changed('dbg0', (len(g.obstacles), len(g.collectibles), len(g.powerups), len(g.particles))):
+                self.set(self.debug[0], f"Entities: obs={len(g.obstacles)} col={len(g.collectibles)} pwr={len(g.powerups)} parts={len(g.particles)}")
+            if self.changed('dbg1', (g.get_speed(), g.base_speed, round(g.distance))):
+                self.set(self.debug[1], f"Speed: {g.get_speed():.2f} (base {g.base_speed:.1f}) dist={g.distance:.0f}")
+            if self.changed('dbg2', (p.y, p.vy, p.on_ground, p.ducking)):
+                self.set(self.debug[2], f"Player y={p.y:.1f} vy={p.vy:.2f} on_ground={p.on_ground} duck={p.ducking}")
+            ap = g.autopilot
+            if self.changed('dbg3', (slowmo, ap and ap.decisions // FPS)):
+                auto = f"  Autopilot: {ap.total_ns / max(1, ap.decisions) / 1e6:.3f} ms/decision " \
+                       f"(max {ap.worst_ns / 1e6:.2f})" if ap else ''
+                self.set(self.debug[3], f"SlowMo: {'ON' if slowmo else 'off'}{auto}")
+            # percentiles mean sorting the window, so refresh a few times a second
+            if prof and prof.frames % PROFILE_HUD_FRAMES == 0:
+                self.set(self.prof, self.profile_text(prof))
 
+    @staticmethod
+    def profile_text(prof: FrameProfiler) -> str:
+        lines = ['%-16s %6s %6s %6s' % ('ms', 'p50', 'p95', 'p99')]
+        for phase in ['frame'] + prof.slowest(6):
+            lines.append('%-16s %6.2f %6.2f %6.2f' % ((phase,) + prof.percentiles(phase)))
+        created = sum(prof.created) / len(prof.created) if prof.created else 0.0
+        lines.append(f"items +{created:.1f}/frame  live {prof.live}  hitches {len(prof.hitches)}  F3:export")
+        return '\n'.join(lines)
 
-def blend_hex(a: str, b: str, t: float) -> str:
-    ar, ag, ab = hex_to_rgb(a)
-    br, bg, bb = hex_to_rgb(b)
-    r = int(lerp(ar, br, t))
-    g = int(lerp(ag, bg, t))
-    b = int(lerp(ab, bb, t))
-    return rgb_to_hex(r, g, b)
 
+class TkView:
+    """Tk front-end: an optional window onto a `Game`.
 
-def invert_hex(h: str) -> str:
-    r, g, b = hex_to_rgb(h)
-    return rgb_to_hex(255 - r, 255 - g, 255 - b)
+    Owns the root window, the canvas, key bindings and the frame loop. The
+    game state is only read here; input is forwarded through `Game` methods.
+    """
 
+    def __init__(self, root: tk.Tk, game: Game):
+        import tkinter as tk
+
+        self.root = root
+        self.game = game
+        self.root.title('Tkinter Dino Runner')
+        self.root.geometry(f'{W}x{H}')
+        self.root.resizable(False, False)
+
+        self.c = tk.Canvas(root, width=W, height=H, bg=DAY_SKY, highlightthickness=0)
+        self.c.pack(fill='both', expand=True)
+
+        # View state
+        self.running = True
+        self.debug = False
+        self.color_mode = 0  # 0 normal, 1 high-contrast
+        self.rng = random.Random(game.seed)  # cosmetic only; never draws from game.rng
+
+        # Persistent scene items (entities own their items, see Entity)
+        self.sky_item = self.c.create_rectangle(0, 0, W, H, fill=DAY_SKY, outline='', tags=('sky',))
+        self.sky_fill = DAY_SKY
+        self.star_items = []
+        for _ in range(STAR_COUNT):
+            x, y = self.rng.randint(0, W), self.rng.randint(0, H//2)
+            self.star_items.append(self.c.create_oval(x, y, x + 1.8, y + 1.8, fill=STAR_COLOR, outline='',
+                                                      state='hidden', tags=('stars',)))
+        self.stars_shown = False
+        self.dim_star = 0       # the star currently twinkled off
+        self.twinkle_in = 0     # frames until the next twinkle
+        self.c.create_line(0, GROUND_Y + 6, W, GROUND_Y + 6, fill=GROUND_DARK, tags=('ground',))
+        self.ground_item = self.c.create_image(0, GROUND_Y, image=SPRITES.ground().image, anchor='nw',
+                                               tags=('ground',))
+        self.ground_x = 0.0
+        self.scroll_drawn = game.scroll  # world scroll the canvas layer reflects
+        self.restack = False             # new items were created; re-sort the layers
+        self.alpha = 1.0                 # interpolation factor between the last two ticks
+
+        self.hud = Hud(self.c)
+        self.prof: Optional[FrameProfiler] = None
+        self.alloc: Optional[AllocProfiler] = AllocProfiler() if os.environ.get('DINO_ALLOC') == '1' else None
+        self.calls: Optional[CallProfiler] = None
+
+        # Particle pool
+        self.part_items: List[int] = []
+        self.part_fills: List[int] = []  # ramp index each pooled item shows, -1 if hidden
+        self.parts_shown = 0
+
+        # Bindings
+        self.root.bind('<KeyPress>', self.on_key)
+        self.root.bind('<KeyRelease>', self.on_key_up)
+
+        # Main loop: fixed-timestep simulation, frames scheduled on deadlines
+        self.step_s = STEP_MS / 1000.0
+        self.acc = 0.0
+        game.clock.sample()
+        self.deadline = time.perf_counter()
+        self.loop()
+
+    # ------------------------- Input ---------------------------------------- #
+    def on_key(self, e):
+        g = self.game
+        if e.keysym in ('space', 'Up'):
+            g.press_jump()
+        elif e.keysym == 'Down':
+            g.set_duck(True)
+        elif e.keysym.lower() == 'p':
+            g.toggle_pause()
+        elif e.keysym.lower() == 'r':
+            g.press_restart()
+        elif e.keysym.lower() == 'm':
+            g.muted = not g.muted
+        elif e.keysym == 'F1':
+            self.debug = not self.debug
+            # the profiler runs only while the debug HUD is up
+            self.prof = g.prof = FrameProfiler() if self.debug else None
+        elif e.keysym == 'F2':
+            self.toggle_alloc()
+        elif e.keysym == 'F3' and self.prof:
+            self.prof.export(PROFILE_FILE)
+        elif e.keysym == 'F4' and not self.calls:
+            self.capture_calls()
+        elif e.keysym.lower() == 'a':
+            g.autopilot = None if g.autopilot else Autopilot(g)
+        elif e.keysym.lower() == 'c':
+            self.color_mode = (self.color_mode + 1) % 2
+        elif e.keysym in ('1', '2', '3'):
+            g.set_difficulty(int(e.keysym))
+
+    def toggle_alloc(self):
+        # switching the allocation profiler off writes its report
+        if self.alloc:
+            self.alloc.export(ALLOC_FILE)
+            self.alloc.stop()
+            self.alloc = None
+        else:
+            self.alloc = AllocProfiler()
+
+    def capture_calls(self, ticks: int = CPROFILE_TICKS, base: str = CPROFILE_BASE) -> CallProfiler:
+        # profiles the frames that run the next `ticks` ticks; see CallProfiler
+        self.calls = CallProfiler(ticks, base)
+        return self.calls
+
+    def on_key_up(self, e):
+        if e.keysym == 'Down':
+            self.game.set_duck(False)
+
+    # ------------------------- Drawing -------------------------------------- #
+    def draw_background(self):
+        # sky
+        i = self.game.sky_idx
+        bg = PALETTE.sky[i] if self.color_mode == 0 else PALETTE.sky_inv[i]
+        if bg is not self.sky_fill:
+            self.sky_fill = bg
+            self.c.itemconfigure(self.sky_item, fill=bg)
+        self.draw_stars(PALETTE.night[i])
+        # clouds (new ones only; the layer itself is moved in draw)
+        for cl in self.game.clouds:
+            cl.draw(self)
+
+    def draw_stars(self, night: bool):
+        c = self.c
+        if night != self.stars_shown:
+            c.itemconfigure('stars', state='normal' if night else 'hidden')
+            self.stars_shown = night
+        if not night:
+            return
+        self.twinkle_in -= 1
+        if self.twinkle_in > 0:
+            return
+        self.twinkle_in = STAR_TWINKLE_FRAMES
+        # relight the last star and dim another
+        c.itemconfigure(self.star_items[self.dim_star], state='normal')
+        self.dim_star = self.rng.randrange(STAR_COUNT)
+        c.itemconfigure(self.star_items[self.dim_star], state='hidden')
+
+    def draw_ground(self, scroll: float):
+        # the strip is one tile wider than the screen and wraps every tile
+        x = -(scroll % GROUND_TILE)
+        if x != self.ground_x:
+            self.c.coords(self.ground_item, x, GROUND_Y)
+            self.ground_x = x
+
+    def draw_entities(self):
+        for a in self.game.collectibles:
+            a.draw(self)
+        for p in self.game.powerups:
+            p.draw(self)
+        for o in self.game.obstacles:
+            o.draw(self)
+        self.game.player.draw(self)
+        self.draw_particles()
+
+    def draw_particles(self):
+        # a pool of ovals mapped 1:1 onto particle slots; spare ones are hidden
+        c = self.c
+        xs, ys, rs, ramps = self.game.particles.frame(self.alpha)
+        items, fills = self.part_items, self.part_fills
+        n = len(xs)
+        while len(items) < n:
+            items.append(c.create_oval(0, 0, 0, 0, outline='', state='hidden', tags=('particles',)))
+            fills.append(-1)
+            self.restack = True
+        for i in range(n):
+            x, y, r = xs[i], ys[i], rs[i]
+            c.coords(items[i], x - r, y - r, x + r, y + r)
+            if fills[i] != ramps[i]:
+                if fills[i] < 0:
+                    c.itemconfigure(items[i], fill=PALETTE.fade[ramps[i]], state='normal')
+                else:
+                    c.itemconfigure(items[i], fill=PALETTE.fade[ramps[i]])
+                fills[i] = ramps[i]
+        for i in range(n, self.parts_shown):
+            c.itemconfigure(items[i], state='hidden')
+            fills[i] = -1
+        self.parts_shown = n
+
+    def draw_ui(self):
+        color = TEXT_COLOR if self.color_mode == 0 else TEXT_INV
+        self.hud.update(self.game, color, self.debug, self.prof)
+
+    def draw(self):
+        c = self.c
+        prof = self.prof
+        c.delete(FRAME_TAG)
+        for e in self.game.retired:
+            e.destroy(c)
+        self.game.retired.clear()
+        # one move shifts every item that scrolls 1:1 with the ground, and
+        # one more the cloud layer at its parallax fraction
+        g = self.game
+        scroll = lerp(g.prev_scroll, g.scroll, self.alpha)
+        dx = scroll - self.scroll_drawn
+        if dx:
+            c.move(WORLD_TAG, -dx, 0)
+            c.move('clouds', -dx * CLOUD_PARALLAX, 0)
+            self.scroll_drawn = scroll
+        if prof:
+            prof.mark('draw.world')
+        self.draw_background()
+        if prof:
+            prof.mark('draw.background')
+        self.draw_ground(scroll)
+        self.draw_entities()
+        if self.restack:
+            # newly created items land on top; put every layer back in order
+            for tag in LAYERS:
+                c.tag_raise(tag)
+            self.restack = False
+        if prof:
+            prof.mark('draw.entities')
+        self.draw_ui()
+        if prof:
+            prof.mark('draw.ui')
+
+    def run_ticks(self) -> int:
+        # run as many fixed ticks as real time demands, but never more
+        # than MAX_CATCHUP_STEPS; beyond that the game slows instead of
+        # spiralling into ever longer frames. Returns the ticks the game
+        # advanced, none while it is paused or over
+        start = self.game.clock.ticks
+        steps = 0
+        while self.acc >= self.step_s and steps < MAX_CATCHUP_STEPS:
+            self.game.update(1.0)
+            self.acc -= self.step_s
+            steps += 1
+        if self.acc >= self.step_s:
+            self.acc = 0.0
+        return self.game.clock.ticks - start
+
+    def loop(self):
+        if not self.running:
+            return
+        t0 = time.perf_counter()
+        self.acc += self.game.clock.sample()
+        prof = self.prof
+        if prof:
+            prof.start()
+        calls = self.calls
+        try:
+            ticks = calls.run('update', self.run_ticks) if calls else self.run_ticks()
+            self.alpha = self.acc / self.step_s if not (self.game.paused or self.game.game_over) else 1.0
+            if prof:
+                prof.mark('tick')  # loop overhead outside the game's own phases
+            if calls:
+                calls.run('draw', self.draw)
+            else:
+                self.draw()
+            AUDIO.flush()  # this frame's sound requests, as one batch
+            if calls and calls.end_frame(ticks):
+                self.calls = None
+                calls.finish()
+            if prof:
+                prof.end_frame(self.c)
+            if self.alloc:
+                self.alloc.end_frame()
+            tm = self.game.telemetry
+            if tm:
+                ms = (time.perf_counter() - t0) * 1000
+                if ms > STEP_MS:
+                    tm.emit(TM_HITCH, 0, ms, STEP_MS)
+        except Exception as e:
+            # Fail-safe overlay
+            self.c.delete(FRAME_TAG)
+            self.c.create_text(W/2, H/2 - 20, text='An error occurred', font=('Consolas', 16, 'bold'), fill='red', tags=FRAME_TAG)
+            self.c.create_text(W/2, H/2 + 10, text=str(e), font=('Consolas', 10), fill='red', tags=FRAME_TAG)
+        finally:
+            # schedule against an absolute deadline so the frame period does
+            # not grow by however long this frame took to update and draw
+            self.deadline += self.step_s
+            t = time.perf_counter()
+            if self.deadline < t:
+                self.deadline = t  # too far behind: resync rather than burst
+            self.root.after(int((self.deadline - t) * 1000), self.loop)
+
+    def end(self):  # pragma: no cover
+        self.running = False
+        self.root.destroy()
 
-def hex_mix_ratio(a: str, b: str) -> float:
-    # return rough similarity of a to b (0..1 where 1 means equal to b)
-    ar, ag, ab = hex_to_rgb(a)
-    br, bg, bb = hex_to_rgb(b)
-    da = abs(ar - br) + abs(ag - bg) + abs(ab - bb)
-    return 1.0 - clamp(da / (255*3), 0.0, 1.0)
 
 # ------------------------------ Main ---------------------------------------- #
 
-def main():
+def run_headless(ticks: int, difficulty: int = 2, seed: Optional[int] = None,
+                 autopilot: bool = False, telemetry: Optional[Telemetry] = None) -> Tuple[Game, int, int]:
+    """Step a headless game `ticks` times, restarting after each game over.
+    Returns the game, the number of runs played and the best score among them."""
+    game = Game(headless=True, difficulty=difficulty, seed=seed)
+    if autopilot:
+        game.autopilot = Autopilot(game)
+    game.attach_telemetry(telemetry)
+    runs = 1
+    best = 0
+    for _ in range(ticks):
+        if game.game_over:
+            best = max(best, game.score)
+            game.restart()
+            runs += 1
+        game.update(1.0)
+    return game, runs, max(best, game.score)
+
+
+def measure_allocations(game: Game, ticks: int) -> Dict[str, float]:
+    """Step `game` for `ticks` ticks under tracemalloc and report how much
+    memory each tick allocates on top of what it started with (the
+    tick's transient peak), plus the net growth over the whole run."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    total = worst = 0
+    for _ in range(ticks):
+        if game.game_over:
+            game.restart()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        game.update(1.0)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - before
+        worst = max(worst, peak - before)
+    end, _ = tracemalloc.get_traced_memory()
+    if started:
+        tracemalloc.stop()
+    return {'ticks': ticks, 'peak_bytes_per_tick': total / max(1, ticks),
+            'max_peak_bytes': worst, 'net_bytes': end - base}
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description='Tkinter Dino Runner')
+    ap.add_argument('--headless', type=int, metavar='TICKS',
+                    help='run only the simulation for TICKS steps (no Tk, no display) and print stats')
+    ap.add_argument('--difficulty', type=int, default=2, choices=(1, 2, 3))
+    ap.add_argument('--time-scale', type=float, default=1.0, metavar='K',
+                    help='run game time K times as fast as real time (e.g. 0.5 for slow motion)')
+    ap.add_argument('--tracemalloc', action='store_true',
+                    help='with --headless: report per-tick allocations instead of throughput')
+    ap.add_argument('--seed', type=int, help='seed for the game RNG (random if omitted)')
+    ap.add_argument('--record', metavar='FILE', help='save an input log of the session to FILE on exit')
+    ap.add_argument('--autopilot', action='store_true',
+                    help='let the game play itself (with --headless: a soak run)')
+    ap.add_argument('--audio', metavar='OUT', default='auto',
+                    help="sound output: 'auto' (default), 'off', or a .wav file to write it to")
+    ap.add_argument('--telemetry', metavar='FILE',
+                    help='log gameplay events to FILE (JSON lines if it ends in .jsonl, else binary)')
+    ap.add_argument('--telemetry-drop', action='store_true',
+                    help='bound telemetry memory by dropping the oldest events when the writer falls behind')
+    ap.add_argument('--scores', action='store_true', help='print the leaderboards and recent runs, then exit')
+    ap.add_argument('--replay', metavar='FILE',
+                    help='replay an input log headlessly and check it ends in the recorded state')
+    args = ap.parse_args(argv)
+    if args.seed is not None and not 0 <= args.seed < SEED_RANGE:
+        ap.error(f'--seed must be in 0..{SEED_RANGE - 1}')
+
+    if args.scores:
+        store = open_store()
+        for d in DIFF_PRESETS:
+            print(f"difficulty {d}:")
+            for i, rec in enumerate(store.top(d, STORE_TOP), 1):
+                print(f"  {i:2d}. {rec.score:7d}  {rec.ticks / FPS:6.1f}s  {rec.coins:3d} coins  {rec.cause}")
+        print('recent:')
+        for rec in store.recent():
+            print(f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(rec.ended))}  d{rec.difficulty} "
+                  f"{rec.score:7d}  {rec.cause}")
+        store.close()
+        return
+
+    if args.replay:
+        log = InputLog.load(args.replay)
+        t0 = time.perf_counter()
+        game = replay(log)
+        secs = time.perf_counter() - t0
+        ok = (game.clock.ticks, game.score, game.state_hash()) == (log.end_tick, log.score, log.digest)
+        print(f"replayed {len(log)} inputs over {game.clock.ticks} ticks in {secs:.2f}s: "
+              f"score {game.score}, state {game.state_hash().hex()} ({'OK' if ok else 'MISMATCH'})")
+        if not ok:
+            sys.exit(1)
+        return
+
+    if args.headless and args.tracemalloc:
+        stats = measure_allocations(Game(headless=True, difficulty=args.difficulty, seed=args.seed), args.headless)
+        print(f"{stats['ticks']} ticks: {stats['peak_bytes_per_tick']:.0f} B/tick transient "
+              f"(max {stats['max_peak_bytes']} B), net {stats['net_bytes']:+d} B")
+        return
+
+    tm = Telemetry(args.telemetry, drop_oldest=args.telemetry_drop) if args.telemetry else None
+    if args.headless:
+        t0 = time.perf_counter()
+        game, runs, best = run_headless(args.headless, args.difficulty, args.seed, args.autopilot, tm)
+        secs = time.perf_counter() - t0
+        if tm:
+            tm.close()
+            print(f"telemetry: {tm.written} events written, {tm.dropped} dropped")
+        print(f"{args.headless} ticks in {secs:.2f}s ({args.headless / max(secs, 1e-9):,.0f} ticks/s), "
+              f"{runs} runs, last score {game.score}, best {best}")
+        pilot = game.autopilot
+        if pilot:
+            print(f"autopilot: {pilot.decisions} decisions, {pilot.total_ns / max(1, pilot.decisions) / 1e3:.1f} us "
+                  f"mean, {pilot.worst_ns / 1e3:.0f} us worst")
+        return
+
+    if args.audio == 'off':
+        AUDIO.sink = NullSink()
+    elif args.audio != 'auto':
+        AUDIO.sink = WavSink(args.audio)
+
+    import tkinter as tk
     root = tk.Tk()
-    Game(root)
+    game = Game(difficulty=args.difficulty, time_scale=args.time_scale, seed=args.seed)
+    if args.autopilot:
+        game.autopilot = Autopilot(game)
+    game.attach_telemetry(tm)
+    if args.record:
+        game.recorder = InputLog(game.seed, game.diff)
+    view = TkView(root, game)
     root.mainloop()
+    if view.alloc:
+        view.toggle_alloc()
+    AUDIO.close()
+    game.store.close()  # writes whatever runs are still queued
+    if tm:
+        tm.close()
+    if args.record:
+        game.recorder.finish(game)
+        game.recorder.save(args.record)
 
 
 if __name__ == '__main__':